@@ -1,21 +1,42 @@
 ﻿"""Unify strings to all use the same quote and etc.
 Source: https://github.com/Zoynels/autopep8_quotes"""
 
-import os
-import re
 import signal
 import sys
 from typing import Any
 
+from autopep8_quotes._util import _cache as _util_cache
+from autopep8_quotes._util import _git_filter as _util_git_filter
+from autopep8_quotes._util import _jobs as _util_jobs
 from autopep8_quotes._util._colorama import col_green
 from autopep8_quotes._util._colorama import col_red
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._file_stats import new_file_stats
+from autopep8_quotes._util._file_stats import open_stats_json
+from autopep8_quotes._util._file_stats import write_file_stats
+from autopep8_quotes._util._files import iter_files
+from autopep8_quotes._util._git_diff import git_error
 from autopep8_quotes._util._io import stdout_print
+from autopep8_quotes._util._log_sink import close_logs
 from autopep8_quotes._util._main import format_file as __base_function__
+from autopep8_quotes._util._profile import new_profile
+from autopep8_quotes._util._profile import print_profile
+from autopep8_quotes._util._profile import profile_merge
+from autopep8_quotes._util._stats import print_stats
+from autopep8_quotes._util._stats import stats_merge
 
 __version__ = "0.6.4"
 __title_name__ = "autopep8_quotes"
 
 
+def __getattr__(name: str) -> Any:
+    """Public API is imported only when it is used: CLI doesn't need it"""
+    if name == "Formatter":
+        from autopep8_quotes.api import Formatter
+        return Formatter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _main(args: Any, standard_out: Any, standard_error: Any) -> int:
     """Run function on files.
 
@@ -23,48 +44,83 @@ def _main(args: Any, standard_out: Any, standard_error: Any) -> int:
 
     from .args import agrs_parse
 
+    argv = args
     kwargs = {}
     kwargs["_standard_out"] = standard_out
     kwargs["_standard_error"] = standard_error
-    args = agrs_parse(args, **kwargs)
+    args = agrs_parse(argv, **kwargs)
+
+    if args.git_filter_process:
+        # Files are read from git, not from args.files
+        return _util_git_filter.run_filter_process(args, sys.stdin.buffer, sys.stdout.buffer)
 
-    filenames = list(set(args.files))
     changes_needed = False
     failure_files_count = 0
     read_files_count = 0
     args._diff_files_count = 0
 
-    while filenames:
-        name = filenames.pop(0)
-        if os.path.isdir(name):
-            if args.recursive:
-                for root, directories, children in os.walk(name):
-                    for f in children:
-                        for pat in args.read_files_matching_pattern:
-                            if re.match(pat, os.path.join(root, f), re.DOTALL):
-                                filenames.append(os.path.join(root, f))
-
-                    directories[:] = [d for d in directories if not d.startswith(".")]
-            else:
-                for f in os.listdir(name):
-                    if os.path.isfile(os.path.join(name, f)):
-                        for pat in args.read_files_matching_pattern:
-                            if re.match(pat, os.path.join(name, f), re.DOTALL):
-                                filenames.append(os.path.join(name, f))
-        elif os.path.isfile(name):
-            try:
+    # --stats-json: records of files are written here, workers return them with results
+    stats_json = open_stats_json(args)
+    try:
+        jobs = _util_jobs.get_jobs_count(args.jobs)
+        if jobs > 1 and _util_jobs.is_parallel_allowed(args):
+            # Files are formatted in worker processes (or threads), output is printed here
+            # in the same order as files were found
+            for result in _util_jobs.format_files_parallel(args, iter_files(args), jobs=jobs, argv=argv, kwargs=kwargs,
+                                                           backend=args.jobs_backend):
                 if args.print_files:
-                    stdout_print(args, f"    read: {name}", otype="ok")
+                    stdout_print(args, f"    read: {result.name}", otype="ok")
                 read_files_count += 1
-                args._read_filename = name
-                if __base_function__(args=args):
+                if result.output:
+                    stdout_print(args, result.output, otype="ok", end="")
+                args._diff_files_count += result.diff_files_count
+                stats_merge(args, result.stats)
+                profile_merge(args, result.profile)
+                write_file_stats(stats_json, result.file_stats, result.profile, error=result.error)
+                if result.exit_code is not None:
+                    sys.exit(result.exit_code)
+                if result.error is not None:
+                    stdout_print(args, result.error, otype="error")
+                    failure_files_count += 1
+                elif result.changed:
                     changes_needed = True
-            except IOError as exception:
-                stdout_print(args, exception, otype="error")
-                failure_files_count += 1
         else:
-            from errno import ENOENT
-            raise IOError(ENOENT, f"File is not exist: {name}", name)
+            for name in iter_files(args):
+                if args.print_files:
+                    stdout_print(args, f"    read: {name}", otype="ok")
+                read_files_count += 1
+                context = file_context(args, _read_filename=name, _diff_files_count=0, _profile=new_profile(args),
+                                       _file_stats=new_file_stats(args, name))
+                error = None
+                try:
+                    if __base_function__(args=context):
+                        changes_needed = True
+                except IOError as exception:
+                    error = str(exception)
+                    stdout_print(args, exception, otype="error")
+                    failure_files_count += 1
+                finally:
+                    args._diff_files_count += context._diff_files_count
+                    profile_merge(args, context._profile)
+                    write_file_stats(stats_json, context._file_stats, context._profile, error=error)
+    except git_error as exception:
+        # Files could not be found: git failed (--since, --staged and etc.)
+        stdout_print(args, str(exception), otype="error")
+        return 1
+    finally:
+        if stats_json is not None:
+            stats_json.close()
+        # Also on KeyboardInterrupt: logs of formatted files are written
+        close_logs()
+
+    if args._stats["cache.saved"]:
+        _util_cache.evict(args)
+
+    if args.print_stats:
+        print_stats(args)
+
+    if args.profile:
+        print_profile(args)
 
     if failure_files_count != 0:
         stdout_print(args, col_red + f"Error: read {read_files_count} source files with failure {failure_files_count}", otype="ok")
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import pathlib
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+def is_cache_enabled(args: SimpleNamespace) -> bool:
+    """Check: results of formatting could be cached.
+
+    Cache is disabled when plugins have side effects on each token (logs, debug).
+    """
+    if getattr(args, "no_cache", True):
+        return False
+    for key in ["debug", "save_values_to_file", "nsq_log_transform"]:
+        if getattr(args, key, False):
+            return False
+    return True
+
+
+def get_cache_dir(args: SimpleNamespace) -> str:
+    """Return location of cache: --cache-dir or user cache directory"""
+    if args.cache_dir:
+        return str(args.cache_dir)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(pathlib.Path.home(), ".cache")
+    return os.path.join(cache_home, "autopep8_quotes")
+
+
+def get_config_hash(args: SimpleNamespace) -> str:
+    """Hash of options which change result of formatting.
+
+    Quote options, enabled ontoken plugins and their order.
+    """
+    from autopep8_quotes import __version__
+
+    config: Any = {}
+    config["version"] = __version__
+    config["inline_quotes"] = args.inline_quotes
+    config["multiline_quotes"] = args.multiline_quotes
+    config["plugin_order_ontoken_order"] = []
+    for ontoken_dict in args._plugin_order_ontoken_order:
+        ontoken_plugin = args._plugins_manager.filter(name=ontoken_dict.name).index(0).plugin()
+        if not ontoken_plugin.is_parse:
+            continue
+        config["plugin_order_ontoken_order"].append({"name": ontoken_dict.name,
+                                                     "args": list(ontoken_dict.args),
+                                                     "kwargs": ontoken_dict.kwargs,
+                                                     "enabled": bool(ontoken_plugin.check_is_enabled(args))})
+    data = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_cache_key(args: SimpleNamespace, source: bytes) -> Optional[str]:
+    """Return key of file content under current config or None if cache is disabled"""
+    if getattr(args, "_cache_config_hash", None) is None:
+        return None
+    return hashlib.sha256(source).hexdigest()
+
+
+def _get_entry_path(args: SimpleNamespace, key: str) -> str:
+    return os.path.join(args._cache_dir, args._cache_config_hash[:16], key[:2], key)
+
+
+def check(args: SimpleNamespace, key: Optional[str]) -> bool:
+    """Check: file content is already formatted under current config"""
+    if key is None:
+        return False
+    fname = _get_entry_path(args, key)
+    try:
+        # Mark entry as recently used
+        os.utime(fname)
+        return True
+    except OSError:
+        return False
+
+
+def save(args: SimpleNamespace, key: Optional[str]) -> bool:
+    """Remember that file content is formatted under current config"""
+    if key is None:
+        return False
+    fname = _get_entry_path(args, key)
+    try:
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        with open(fname, "wb"):
+            pass
+        return True
+    except OSError:
+        return False
+
+
+def evict(args: SimpleNamespace) -> int:
+    """Remove least recently used entries when cache is bigger than --cache-max-entries.
+
+    Returns count of removed entries.
+    """
+    if getattr(args, "_cache_config_hash", None) is None:
+        return 0
+    max_entries = max(int(args.cache_max_entries), 0)
+
+    entries: List[Tuple[float, str]] = []
+    stack = [args._cache_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            continue
+
+    if len(entries) <= max_entries:
+        return 0
+
+    entries.sort()
+    removed = 0
+    for _, fname in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(fname)
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+from typing import Any
+
+
+class file_context(SimpleNamespace):
+    """State of one file over shared args of run.
+
+    Attributes are written into context, attributes which are not set in context are read from args of run.
+    So args of run are not changed while file is formatted and several files could be formatted at once.
+    Context is passed to plugins instead of args: parse() and show_or_save() work with it as with args.
+    """
+
+    def __init__(self, args: SimpleNamespace, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.__dict__["_run_args"] = args
+
+    def __getattr__(self, name: str) -> Any:
+        # Called only when attribute is not set in context
+        try:
+            run_args = self.__dict__["_run_args"]
+        except KeyError:
+            raise AttributeError(name)
+        return getattr(run_args, name)
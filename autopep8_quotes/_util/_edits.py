@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import tokenize
+
+# Edit of source: (start, end, replacement), start and end are (row, col) like positions of tokens
+Edit = Tuple[Tuple[int, int], Tuple[int, int], str]
+
+
+def get_token_edit(original: tokenize.TokenInfo, token: Any) -> Optional[Edit]:
+    """Return edit which replaces original token by changed token, None if it is not changed"""
+    if (token.string == original.string) and (token.start == original.start) and (token.end == original.end):
+        return None
+    return (min(original.start, token.start), max(original.end, token.end), token.string)
+
+
+def add_edit(args: SimpleNamespace, start: Tuple[int, int], end: Tuple[int, int], replacement: str) -> None:
+    """Plugin could replace any part of source (not only own token) in current pass"""
+    source_edits = getattr(args, "_source_edits", None)
+    if source_edits is not None:
+        source_edits.append((start, end, replacement))
+
+
+def get_lines_offsets(source: str) -> List[int]:
+    """Offsets of lines starts: lines are split as by readline() of tokenize"""
+    offsets = [0, 0]
+    pos = source.find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = source.find("\n", pos + 1)
+    return offsets
+
+
+def get_offset(offsets: List[int], source: str, pos: Tuple[int, int]) -> int:
+    """Transform (row, col) into position in source, rows after end of source are end of source"""
+    row, col = pos
+    if row >= len(offsets):
+        return len(source)
+    return min(offsets[row] + col, len(source))
+
+
+def apply_edits(source: str, edits: List[Edit]) -> str:
+    """Replace parts of source, other text is not changed.
+
+    Edits of same part of source are resolved by order: later edit (later plugin) is used.
+    Edits which overlap previous edit (ordered by start) and edits which
+    don't change source are skipped.
+    """
+    if not edits:
+        return source
+
+    offsets = get_lines_offsets(source)
+    replacements = {}
+    for start, end, replacement in edits:
+        replacements[(get_offset(offsets, source, start), get_offset(offsets, source, end))] = replacement
+    spans = []
+    for (start_offset, end_offset), replacement in replacements.items():
+        if source[start_offset:end_offset] != replacement:
+            spans.append((start_offset, -end_offset, replacement))
+    if not spans:
+        return source
+
+    result = []
+    last = 0
+    for start_offset, end_offset, replacement in sorted(spans):
+        if start_offset < last:
+            continue
+        result.append(source[last:start_offset])
+        result.append(replacement)
+        last = -end_offset
+    result.append(source[last:])
+    return "".join(result)
@@ -0,0 +1,99 @@
+import io
+import json
+from types import SimpleNamespace
+from typing import IO
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import tokenize
+
+# Size of buffer of --stats-json file: records are small, they are written by large blocks
+stats_json_buffer_size = 1024 * 1024
+
+
+def new_file_stats(args: SimpleNamespace, name: str) -> Optional[Dict[str, Any]]:
+    """Return empty record of file if --stats-json is enabled, otherwise None.
+
+    tokens and string_tokens are None if file is not tokenized (cache hit, prefilter, noqa and etc.),
+    cache is "hit", "miss" or None (cache is disabled).
+    """
+    if not getattr(args, "stats_json", None):
+        return None
+    stats: Dict[str, Any] = {}
+    stats["path"] = name
+    stats["bytes"] = 0
+    stats["tokens"] = None
+    stats["string_tokens"] = None
+    stats["changed_literals"] = 0
+    stats["quotes_codes"] = {}
+    stats["cache"] = None
+    return stats
+
+
+def file_stats_set(args: SimpleNamespace, name: str, value: Any) -> None:
+    """Set value of record, do nothing if --stats-json is disabled"""
+    stats = getattr(args, "_file_stats", None)
+    if stats is not None:
+        stats[name] = value
+
+
+def file_stats_add(args: SimpleNamespace, name: str, value: int = 1) -> None:
+    """Increase value of record"""
+    stats = getattr(args, "_file_stats", None)
+    if stats is not None:
+        stats[name] += value
+
+
+def file_stats_count(args: SimpleNamespace, name: str, key: str) -> None:
+    """Increase counter of key in histogram of record"""
+    stats = getattr(args, "_file_stats", None)
+    if stats is not None:
+        stats[name][key] = stats[name].get(key, 0) + 1
+
+
+def file_stats_tokens(args: SimpleNamespace, all_tokens: List[tokenize.TokenInfo]) -> None:
+    """Count tokens of source of file"""
+    stats = getattr(args, "_file_stats", None)
+    if stats is not None:
+        stats["tokens"] = len(all_tokens)
+        stats["string_tokens"] = sum(1 for token in all_tokens if token.type == tokenize.STRING)
+
+
+def file_stats_changed_literals(args: SimpleNamespace, all_tokens: List[tokenize.TokenInfo], formatted: str) -> None:
+    """Count string tokens of source which differ in formatted source: each literal is counted once for all passes"""
+    stats = getattr(args, "_file_stats", None)
+    if stats is None:
+        return
+    try:
+        formatted_tokens = tokenize.generate_tokens(io.StringIO(formatted).readline)
+        new = [token.string for token in formatted_tokens if token.type == tokenize.STRING]
+    except (tokenize.TokenError, SyntaxError):
+        return
+    old = [token.string for token in all_tokens if token.type == tokenize.STRING]
+    stats["changed_literals"] = sum(1 for x, y in zip(old, new) if x != y) + abs(len(old) - len(new))
+
+
+def open_stats_json(args: SimpleNamespace) -> Optional[IO[str]]:
+    """Open --stats-json file for records of run or return None"""
+    if not getattr(args, "stats_json", None):
+        return None
+    return open(args.stats_json, "w", encoding="utf-8", buffering=stats_json_buffer_size)
+
+
+def write_file_stats(stream: Optional[IO[str]],
+                     stats: Optional[Dict[str, Any]],
+                     profile: Optional[Dict[str, List[Any]]],
+                     error: Optional[str] = None
+                     ) -> None:
+    """Write record of file as one line of json.
+
+    profile: timings of file, only stages are written (seconds).
+    """
+    if stream is None or stats is None:
+        return
+    record = dict(stats)
+    record["stages"] = {name[len("stage."):]: seconds for name, (calls, seconds) in (profile or {}).items() if name.startswith("stage.")}
+    record["error"] = error
+    stream.write(json.dumps(record, sort_keys=True) + "\n")
@@ -0,0 +1,161 @@
+import fnmatch
+import os
+import re
+from collections import deque
+from errno import ENOENT
+from types import SimpleNamespace
+from typing import Any
+from typing import Deque
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Set
+from typing import Tuple
+
+from autopep8_quotes._util import _git_diff
+from autopep8_quotes._util import _gitignore
+
+
+def get_files_pattern(patterns: List[str]) -> Pattern[Any]:
+    """One compiled alternation of all --read-files-matching-pattern"""
+    return re.compile("|".join(f"(?:{pat})" for pat in patterns), re.DOTALL)
+
+
+def split_patterns(value: Any) -> List[str]:
+    """Patterns of --exclude: comma separated string or list"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [x.strip() for x in value if x.strip()]
+
+
+def compile_fnmatch(patterns: List[str]) -> Optional[Pattern[Any]]:
+    """One compiled alternation of fnmatch patterns, None if there are no patterns"""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pat) for pat in patterns))
+
+
+def get_exclude(args: SimpleNamespace) -> SimpleNamespace:
+    """Compiled --exclude, --extend-exclude and --gitignore.
+
+    Pattern with "/" matches absolute path (relative to current directory), others match name of file or directory.
+    """
+    patterns = split_patterns(getattr(args, "exclude", None)) + split_patterns(getattr(args, "extend_exclude", None))
+    exclude = SimpleNamespace()
+    exclude.names = compile_fnmatch([pat for pat in patterns if "/" not in pat])
+    exclude.paths = compile_fnmatch([os.path.abspath(pat) for pat in patterns if "/" in pat])
+    exclude.gitignore = bool(getattr(args, "gitignore", False))
+    # Rules of .gitignore by directory: each file is read once
+    exclude.gitignore_cache = {}
+    return exclude
+
+
+def is_excluded(exclude: Optional[SimpleNamespace], name: str, path: str) -> bool:
+    """Check: file or directory matches --exclude or --extend-exclude"""
+    if exclude is None:
+        return False
+    if exclude.names is not None and exclude.names.match(os.path.basename(name)):
+        return True
+    if exclude.paths is not None and exclude.paths.match(os.path.abspath(path)):
+        return True
+    return False
+
+
+def is_parent_excluded(exclude: Optional[SimpleNamespace], path: str, root: str) -> bool:
+    """Check: file or any of its directories below root matches --exclude or --extend-exclude"""
+    while path and path != root and path != os.path.dirname(path):
+        if is_excluded(exclude, path, path):
+            return True
+        path = os.path.dirname(path)
+    return False
+
+
+def iter_git_diff_files(args: SimpleNamespace, pattern: Pattern[Any], exclude: Optional[SimpleNamespace]) -> Iterator[str]:
+    """Yield files changed in local git (--since, --staged) which match pattern and are not excluded"""
+    root = os.path.abspath(os.curdir)
+    staged = getattr(args, "staged", False) or getattr(args, "staged_hunks", False)
+    for name in _git_diff.get_changed_files(args.files, since=getattr(args, "since", None), staged=staged):
+        if not pattern.match(name) or not os.path.isfile(name):
+            continue
+        if is_parent_excluded(exclude, name, root):
+            continue
+        yield name
+
+
+def iter_dir_files(name: str, pattern: Pattern[Any], recursive: bool, exclude: Optional[SimpleNamespace] = None) -> Iterator[Tuple[str, str]]:
+    """Yield matching files of directory while it is scanned: (path, real path).
+
+    Hidden directories (started with ".") and symlinks to directories are not scanned.
+    Excluded and ignored by .gitignore directories are pruned before they are scanned.
+    """
+    stack: List[Tuple[str, str, Optional[Tuple[_gitignore.Level, ...]]]] = [(name, os.path.realpath(name), None)]
+    while stack:
+        subdirs = []
+        path, realpath, levels = stack.pop()
+        if exclude is not None and exclude.gitignore:
+            # Rules of .gitignore files are compiled once for each directory level
+            if levels is None:
+                levels = _gitignore.get_root_levels(realpath, exclude.gitignore_cache)
+            else:
+                levels = _gitignore.get_levels(realpath, levels, exclude.gitignore_cache)
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if recursive and not entry.name.startswith(".") and not entry.is_symlink():
+                            entry_realpath = os.path.join(realpath, entry.name)
+                            if is_excluded(exclude, entry.name, entry.path):
+                                continue
+                            if levels and _gitignore.is_ignored(levels, entry_realpath, True):
+                                continue
+                            subdirs.append((entry.path, entry_realpath, levels))
+                    elif entry.is_file() and pattern.match(entry.path):
+                        if entry.is_symlink():
+                            entry_realpath = os.path.realpath(entry.path)
+                        else:
+                            entry_realpath = os.path.join(realpath, entry.name)
+                        if is_excluded(exclude, entry.name, entry.path):
+                            continue
+                        if levels and _gitignore.is_ignored(levels, os.path.join(realpath, entry.name), False):
+                            continue
+                        yield entry.path, entry_realpath
+        except OSError:
+            # Directory is not readable or removed while it is scanned: skip it as os.walk()
+            continue
+        # Scan directories in order of listing
+        stack.extend(reversed(subdirs))
+
+
+def iter_files(args: SimpleNamespace) -> Iterator[str]:
+    """Yield files to format from args.files (directories are expanded).
+
+    Files are yielded while directories are scanned, same file is yielded once.
+    With --since or --staged only changed files in args.files (or in current directory) are yielded.
+    """
+    pattern = get_files_pattern(args.read_files_matching_pattern)
+    exclude = get_exclude(args)
+    if _git_diff.is_git_diff_enabled(args):
+        yield from iter_git_diff_files(args, pattern, exclude)
+        return
+
+    seen: Set[str] = set()
+    queue: Deque[str] = deque(args.files or [])
+
+    while queue:
+        name = queue.popleft()
+        if is_excluded(exclude, os.path.normpath(name), name):
+            continue
+        if os.path.isdir(name):
+            found: Iterator[Tuple[str, str]] = iter_dir_files(name, pattern, args.recursive, exclude)
+        elif os.path.isfile(name):
+            found = iter([(name, os.path.realpath(name))])
+        else:
+            raise IOError(ENOENT, f"File is not exist: {name}", name)
+
+        for fname, realpath in found:
+            if realpath not in seen:
+                seen.add(realpath)
+                yield fname
@@ -1,61 +1,147 @@
-﻿import os
+﻿from functools import lru_cache
 from types import SimpleNamespace
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Pattern
 from typing import Tuple
 from typing import Union
 
 import ast
 
-from autopep8_quotes._util._io import open_with_encoding
 from autopep8_quotes._util._io import stdout_print
+from autopep8_quotes._util._log_sink import write_log
+
+
+class token_context(object):
+    """Token info for plugins, it could be used like dict.
+
+    Position strings (text, pos, pos1, pos2) are formatted on first access:
+    they are needed only for logs.
+    """
+    __slots__ = ("token_type", "token_string", "start", "end", "line", "filename",
+                 "_text", "_pos", "_pos1", "_pos2", "_extra")
+
+    _keys = ("token_type", "token_string", "start", "end", "line", "filename", "text", "pos", "pos1", "pos2")
+
+    def __init__(self, token_type: int, token_string: str, start: Tuple[int, int],
+                 end: Tuple[int, int], line: str, filename: str) -> None:
+        self.token_type = token_type
+        self.token_string = token_string
+        self.start = start
+        self.end = end
+        self.line = line
+        self.filename = filename
+        self._text: Optional[str] = None
+        self._pos: Optional[str] = None
+        self._pos1: Optional[str] = None
+        self._pos2: Optional[str] = None
+        # Keys added by plugins
+        self._extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = f"{self.pos2}: {self.token_string}"
+        return self._text
+
+    @property
+    def pos(self) -> str:
+        if self._pos is None:
+            self._pos = f"Line:pos {self.pos1}"
+        return self._pos
+
+    @property
+    def pos1(self) -> str:
+        if self._pos1 is None:
+            self._pos1 = f"({self.start[0]}:{self.start[1]} - {self.end[0]}:{self.end[1]})"
+        return self._pos1
+
+    @property
+    def pos2(self) -> str:
+        if self._pos2 is None:
+            self._pos2 = f"Line {self.start[0]}, pos {self.start[1]} - line {self.end[0]}, pos {self.end[1]}"
+        return self._pos2
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._keys:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in ("text", "pos", "pos1", "pos2"):
+            setattr(self, f"_{key}", value)
+        elif key in self._keys:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys or (self._extra is not None and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        return f"token_context({dict(self.items())!r})"
+
+    def keys(self) -> List[str]:
+        return list(self._keys) + list(self._extra or [])
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
 
 def get_token_dict(token_type: int, token_string: str, start: Tuple[int, int],
                    end: Tuple[int, int], line: str,
-                   filename: str) -> Dict[str, Any]:
-    _dict: Dict[str, Union[str, int, Tuple[int, int]]] = {}
-    _dict["token_type"] = token_type
-    _dict["token_string"] = token_string
-    _dict["start"] = start
-    _dict["end"] = end
-    _dict["line"] = line
-    _dict["filename"] = filename
-    _dict["text"] = f"Line {start[0]}, pos {start[1]} - line {end[0]}, pos {end[1]}: {token_string}"
-    _dict["pos"] = f"Line:pos ({start[0]}:{start[1]} - {end[0]}:{end[1]})"
-    _dict["pos1"] = f"({start[0]}:{start[1]} - {end[0]}:{end[1]})"
-    _dict["pos2"] = f"Line {start[0]}, pos {start[1]} - line {end[0]}, pos {end[1]}"
-
-    return _dict
-
-
-def save_values_to_file(args: SimpleNamespace, name: str, input_list: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
-    os.makedirs("log", exist_ok=True)
-    fname = f"log/autopep8_quotes.{name}.{args._datetime_start.strftime('%Y%m%d %H%M%S')}.txt"
-    if isinstance(input_list, (dict)):
+                   filename: str) -> token_context:
+    return token_context(token_type, token_string, start, end, line, filename)
+
+
+@lru_cache(maxsize=256)
+def get_log_filename(name: str, datetime_start: Any) -> str:
+    """Name of log file of run, it is formatted once for each log"""
+    return f"log/autopep8_quotes.{name}.{datetime_start.strftime('%Y%m%d %H%M%S')}.txt"
+
+
+def save_values_to_file(args: SimpleNamespace, name: str, input_list: Union[Dict[str, Any], token_context, List[Any]]) -> None:
+    """Append tokens to log file, file is written by log sink in background"""
+    fname = get_log_filename(name, args._datetime_start)
+    if isinstance(input_list, (dict, token_context)):
         input_list = [input_list]
     elif not isinstance(input_list, (list)):
         input_list = [{"filename": args._read_filename, "pos1": "Unknown (error)", "token_string": str(input_list)}]
 
     if input_list:
         stdout_print(args, f"Write strings to {fname} from file " + input_list[0]["filename"])
-    with open_with_encoding(fname, mode="a", encoding="utf-8") as output_file:
-        for i, token_dict in enumerate(input_list):
-            try:
-                for key in token_dict:
-                    if isinstance(token_dict[key], (bytes)):
-                        token_dict[key] = token_dict[key].decode()
-
-                output_file.write("\n")
-                output_file.write("# " + token_dict["filename"] + ":" + token_dict["pos1"])
-                output_file.write("\n")
-                output_file.write(f"a_{i+1} = " + token_dict["token_string"])
-                output_file.write("\n")
-            except BaseException as e:
-                stdout_print(args, e)
-                stdout_print(args, f"    for token_dict: {token_dict}")
+    lines = []
+    for i, token_dict in enumerate(input_list):
+        try:
+            for key in ["filename", "pos1", "token_string"]:
+                if isinstance(token_dict[key], (bytes)):
+                    token_dict[key] = token_dict[key].decode()
+
+            lines.append("\n# " + token_dict["filename"] + ":" + token_dict["pos1"] + "\n" + f"a_{i+1} = " + token_dict["token_string"] + "\n")
+        except BaseException as e:
+            stdout_print(args, e)
+            stdout_print(args, f"    for token_dict: {token_dict}")
+    if lines:
+        write_log(fname, "".join(lines))
 
 
 def isevaluatable(s: str, prefix: str = "") -> Tuple[bool, Any]:
@@ -0,0 +1,56 @@
+import os
+import subprocess  # nosec
+from types import SimpleNamespace
+from typing import List
+from typing import Optional
+
+
+def is_git_diff_enabled(args: SimpleNamespace) -> bool:
+    """Check: files are taken from local git (--since, --staged), not from scan of directories"""
+    return bool(getattr(args, "since", None)) or bool(getattr(args, "staged", False)) or bool(getattr(args, "staged_hunks", False))
+
+
+class git_error(IOError):
+    """Git command failed or git is not found"""
+
+
+def run_git(git_args: List[str], cwd: Optional[str] = None) -> str:
+    """Run git command and return its stdout, raise git_error (IOError) if git failed"""
+    try:
+        proc = subprocess.run(["git"] + git_args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)  # nosec
+    except OSError as e:
+        raise git_error(f"Can't run git: {e}")
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise git_error(f"git {' '.join(git_args)} failed: {stderr}")
+    return proc.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def get_git_toplevel(cwd: Optional[str] = None) -> str:
+    """Root of working tree of git repository"""
+    return run_git(["rev-parse", "--show-toplevel"], cwd=cwd).rstrip("\n")
+
+
+def get_changed_files(paths: Optional[List[str]], since: Optional[str] = None, staged: bool = False,
+                      cwd: Optional[str] = None) -> List[str]:
+    """Files changed since revision (compared with working tree) and/or staged in index.
+
+    Deleted files are skipped, paths (current directory by default) limit search as pathspec of git diff.
+    Files are returned in order of git diff, each file once.
+    """
+    toplevel = get_git_toplevel(cwd)
+    pathspec = ["--"] + list(paths or ["."])
+    commands = []
+    if since:
+        commands.append(["diff", "--name-only", "-z", "--diff-filter=d", since] + pathspec)
+    if staged:
+        commands.append(["diff", "--cached", "--name-only", "-z", "--diff-filter=d"] + pathspec)
+
+    files = []
+    seen = set()
+    for command in commands:
+        for name in run_git(command, cwd=cwd).split("\0"):
+            if name and name not in seen:
+                seen.add(name)
+                files.append(os.path.join(toplevel, name))
+    return files
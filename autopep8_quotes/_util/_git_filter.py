@@ -0,0 +1,158 @@
+"""Long-running git filter process (gitattributes `filter.<driver>.process`).
+
+Git starts the process once and sends all blobs through pkt-line protocol:
+https://git-scm.com/docs/gitattributes#_long_running_filter_process
+
+    [filter "autopep8_quotes"]
+        process = autopep8_quotes --git-filter-process
+"""
+import contextlib
+import sys
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._io import decode_source
+from autopep8_quotes._util._main import format_code
+
+# Max length of data in one packet (65520 bytes of packet without 4 bytes of length)
+pkt_max_data = 65516
+supported_capabilities = ["clean", "smudge"]
+
+
+def read_pkt_line(stream: Any) -> Optional[bytes]:
+    """Read one packet, None is flush packet. Raise EOFError when git closed pipe"""
+    header = stream.read(4)
+    if not header:
+        raise EOFError("git closed filter pipe")
+    if len(header) != 4:
+        raise ValueError(f"Bad packet header: {header!r}")
+    length = int(header, 16)
+    if length == 0:
+        return None
+    if length <= 4:
+        raise ValueError(f"Bad packet length: {header!r}")
+    data = stream.read(length - 4)
+    if len(data) != length - 4:
+        raise EOFError("git closed filter pipe inside packet")
+    return bytes(data)
+
+
+def read_pkt_text_list(stream: Any) -> List[str]:
+    """Read text packets until flush packet"""
+    result: List[str] = []
+    while True:
+        data = read_pkt_line(stream)
+        if data is None:
+            return result
+        result.append(data.decode("utf-8").rstrip("\n"))
+
+
+def read_pkt_content(stream: Any) -> bytes:
+    """Read binary packets until flush packet"""
+    result: List[bytes] = []
+    while True:
+        data = read_pkt_line(stream)
+        if data is None:
+            return b"".join(result)
+        result.append(data)
+
+
+def write_pkt_line(stream: Any, data: bytes) -> None:
+    stream.write(b"%04x" % (len(data) + 4))
+    stream.write(data)
+
+
+def write_pkt_flush(stream: Any) -> None:
+    stream.write(b"0000")
+    stream.flush()
+
+
+def write_pkt_text_list(stream: Any, lines: List[str]) -> None:
+    """Write text packets and flush packet"""
+    for line in lines:
+        write_pkt_line(stream, f"{line}\n".encode("utf-8"))
+    write_pkt_flush(stream)
+
+
+def write_pkt_content(stream: Any, content: bytes) -> None:
+    """Write content split into packets and flush packet"""
+    for i in range(0, len(content), pkt_max_data):
+        write_pkt_line(stream, content[i:i + pkt_max_data])
+    write_pkt_flush(stream)
+
+
+def parse_keys(lines: List[str]) -> Dict[str, str]:
+    """Transform ["key=value", ...] into dict"""
+    result = {}
+    for line in lines:
+        key, _, value = line.partition("=")
+        result[key] = value
+    return result
+
+
+def handshake(stdin: Any, stdout: Any) -> List[str]:
+    """Agree on protocol version and capabilities, return capabilities of filter"""
+    welcome = read_pkt_text_list(stdin)
+    if not welcome or welcome[0] != "git-filter-client" or "version=2" not in welcome[1:]:
+        raise ValueError(f"Unknown git filter client: {welcome}")
+    write_pkt_text_list(stdout, ["git-filter-server", "version=2"])
+
+    capabilities = []
+    for line in read_pkt_text_list(stdin):
+        key, _, value = line.partition("=")
+        if key == "capability" and value in supported_capabilities:
+            capabilities.append(value)
+    write_pkt_text_list(stdout, [f"capability={x}" for x in capabilities])
+    return capabilities
+
+
+def format_blob(args: SimpleNamespace, pathname: str, content: bytes) -> bytes:
+    """Return formatted content of file, it is encoded as original"""
+    loaded = decode_source(content)
+    context = file_context(args, _read_filename=pathname, _read_encoding=loaded.encoding)
+    formatted_source = format_code(loaded.text, args=context, filename=pathname)
+    if formatted_source == loaded.text:
+        return content
+    result: bytes = formatted_source.encode(loaded.encoding)
+    return result
+
+
+def run_filter_process(args: SimpleNamespace, stdin: Any, stdout: Any) -> int:
+    """Serve clean and smudge commands of git until it closes pipe.
+
+    Both clean and smudge return formatted content.
+    """
+    try:
+        capabilities = handshake(stdin, stdout)
+    except (EOFError, ValueError) as e:
+        print(f"autopep8_quotes: git filter process: {e}", file=sys.stderr)
+        return 1
+
+    while True:
+        try:
+            keys = parse_keys(read_pkt_text_list(stdin))
+            content = read_pkt_content(stdin)
+        except EOFError:
+            return 0
+
+        if keys.get("command") not in capabilities:
+            write_pkt_text_list(stdout, ["status=error"])
+            continue
+
+        try:
+            # Messages of plugins should not break protocol on stdout
+            with contextlib.redirect_stdout(sys.stderr):
+                result = format_blob(args, keys.get("pathname", ""), content)
+        except Exception as e:
+            print(f"autopep8_quotes: git filter process: {keys.get('pathname', '')}: {e}", file=sys.stderr)
+            write_pkt_text_list(stdout, ["status=error"])
+            continue
+
+        write_pkt_text_list(stdout, ["status=success"])
+        write_pkt_content(stdout, result)
+        # Keep status=success after content
+        write_pkt_flush(stdout)
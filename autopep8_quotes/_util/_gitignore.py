@@ -0,0 +1,134 @@
+import os
+import re
+from types import SimpleNamespace
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+# Rules of one .gitignore: (directory of .gitignore, rules)
+Level = Tuple[str, List[SimpleNamespace]]
+
+
+def translate_pattern(pattern: str) -> str:
+    """Transform pattern of .gitignore (without "!" and trailing "/") into regex of path relative to .gitignore"""
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    res = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            res.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            res.append(".*")
+            i += 2
+            continue
+        i += 1
+        if c == "*":
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "\\" and i < n:
+            res.append(re.escape(pattern[i]))
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 1 if pattern.startswith(("!", "^"), i) else i)
+            if j == -1:
+                res.append(re.escape(c))
+                continue
+            body = pattern[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            res.append(f"[{body}]")
+            i = j + 1
+        else:
+            res.append(re.escape(c))
+    if not anchored:
+        # Pattern without "/" matches name on any level
+        res.insert(0, "(?:.*/)?")
+    return "".join(res)
+
+
+def parse_gitignore(lines: List[str]) -> List[SimpleNamespace]:
+    """Compile lines of .gitignore into rules"""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        rule = SimpleNamespace()
+        rule.negate = line.startswith("!")
+        if rule.negate or line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+        rule.dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        rule.regex = re.compile(translate_pattern(line), re.DOTALL)
+        rules.append(rule)
+    return rules
+
+
+def load_gitignore(dirname: str, cache: Dict[str, List[SimpleNamespace]]) -> List[SimpleNamespace]:
+    """Rules of .gitignore in directory, each .gitignore is read once"""
+    if dirname not in cache:
+        try:
+            with open(os.path.join(dirname, ".gitignore"), "r", encoding="utf-8", errors="replace") as f:
+                cache[dirname] = parse_gitignore(f.readlines())
+        except OSError:
+            cache[dirname] = []
+    return cache[dirname]
+
+
+def get_levels(dirname: str, levels: Tuple[Level, ...], cache: Dict[str, List[SimpleNamespace]]) -> Tuple[Level, ...]:
+    """Add rules of .gitignore in directory (real path) to rules of parent directories"""
+    rules = load_gitignore(dirname, cache)
+    if not rules:
+        return levels
+    return levels + ((dirname, rules),)
+
+
+def get_parent_levels(dirname: str, cache: Dict[str, List[SimpleNamespace]]) -> Tuple[Level, ...]:
+    """Rules of .gitignore files from root of git repository to parent of directory (real path)"""
+    parents = []
+    path = dirname
+    while True:
+        parent = os.path.dirname(path)
+        if os.path.exists(os.path.join(path, ".git")):
+            break
+        if parent == path:
+            # Directory is not in git repository
+            return ()
+        parents.append(parent)
+        path = parent
+
+    levels: Tuple[Level, ...] = ()
+    for parent in reversed(parents):
+        levels = get_levels(parent, levels, cache)
+    return levels
+
+
+def is_ignored(levels: Tuple[Level, ...], realpath: str, is_dir: bool) -> bool:
+    """Check: path is ignored by .gitignore rules.
+
+    Deeper .gitignore overrides parent one, last matched rule of .gitignore wins.
+    """
+    for dirname, rules in reversed(levels):
+        relpath = realpath[len(dirname):].lstrip(os.sep)
+        if os.sep != "/":
+            relpath = relpath.replace(os.sep, "/")
+        for rule in reversed(rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(relpath):
+                return not rule.negate
+    return False
+
+
+def get_root_levels(dirname: str, cache: Dict[str, List[SimpleNamespace]]) -> Tuple[Level, ...]:
+    """Rules of .gitignore files which apply to directory (real path) and its files"""
+    return get_levels(dirname, get_parent_levels(dirname, cache), cache)
@@ -10,7 +10,7 @@ from typing import Dict
 from typing import Pattern
 from typing import Union
 
-from pkg_resources import iter_entry_points
+import tokenize
 
 
 def open_with_encoding(filename: str, encoding: str = "", mode: str = "rb") -> Any	:
@@ -34,18 +34,36 @@ def open_with_encoding(filename: str, encoding: str = "", mode: str = "rb") -> A
 
 def detect_encoding(filename: str) -> str:
     """Return file encoding."""
-    from lib2to3.pgen2 import tokenize as lib2to3_tokenize
-    mode = "rb"
-    try:
-        with open(filename, mode=mode) as input_file:
-            encoding: str = lib2to3_tokenize.detect_encoding(input_file.readline)[0]  # type: ignore
-            # Check for correctness of encoding.
-            with open_with_encoding(filename, encoding, mode=mode) as input_file:
-                input_file.read()
+    encoding: str = load_source(filename).encoding
+    return encoding
+
+
+def load_source(filename: str) -> SimpleNamespace:
+    """Read file once and decode it by decode_source()"""
+    return decode_source(read_source_bytes(filename))
+
+
+def read_source_bytes(filename: str) -> bytes:
+    """Read file as is"""
+    with open(filename, mode="rb") as input_file:
+        return input_file.read()
+
 
-        return encoding
+def decode_source(raw: bytes) -> SimpleNamespace:
+    """Decode source by BOM or coding cookie, "latin-1" if it is wrong.
+
+    Returns raw bytes, encoding and decoded text.
+    """
+    result = SimpleNamespace()
+    result.raw = raw
+    try:
+        result.encoding = tokenize.detect_encoding(io.BytesIO(raw).readline)[0]
+        # Check for correctness of encoding.
+        result.text = raw.decode(result.encoding)
     except (SyntaxError, LookupError, UnicodeDecodeError):
-        return "latin-1"
+        result.encoding = "latin-1"
+        result.text = raw.decode(result.encoding)
+    return result
 
 
 def load_modules(search_path: str, pat: Union[str, Pattern[Any]]) -> Dict[str, Any]:
@@ -76,10 +94,22 @@ def load_modules(search_path: str, pat: Union[str, Pattern[Any]]) -> Dict[str, A
     return _modules_dict
 
 
+def iter_entry_points(group: str) -> Any:
+    """Entry points of group from importlib.metadata (pkg_resources is slow to import)"""
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    # Python < 3.10: dict of groups
+    return entry_points.get(group, [])
+
+
 def load_modules_ep(group: str) -> Dict[str, Any]:
     available_methods = {}
     for entry_point in iter_entry_points(group=group):
-        name = f"{entry_point.module_name}:{entry_point.name}"
+        module_name = entry_point.value.split(":")[0].strip()
+        name = f"{module_name}:{entry_point.name}"
         available_methods[name] = SimpleNamespace()
         available_methods[name].ep = entry_point
         available_methods[name].loaded = entry_point.load()
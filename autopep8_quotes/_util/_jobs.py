@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import io
+import os
+from collections import deque
+from types import SimpleNamespace
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._file_stats import new_file_stats
+from autopep8_quotes._util._log_sink import flush_logs
+from autopep8_quotes._util._main import format_file
+from autopep8_quotes._util._profile import new_profile
+from autopep8_quotes._util._stats import new_stats
+
+# Args of worker process, they are prepared once by _worker_init()
+_worker_args: Any = None
+# Count of submitted files for each worker process
+queue_size_per_job = 4
+
+
+def jobs_type(value: str) -> str:
+    """Type of --jobs for argparse: positive number or 'auto', other values are errors of usage"""
+    if value.strip().lower() == "auto":
+        return "auto"
+    try:
+        if int(value) >= 1:
+            return value.strip()
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"expected positive number or 'auto', got: {value!r}")
+
+
+def get_jobs_count(value: Any) -> int:
+    """Transform --jobs value into number of worker processes"""
+    if value is None:
+        return 1
+    if str(value).strip().lower() in ("auto", "0"):
+        return os.cpu_count() or 1
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def is_parallel_allowed(args: SimpleNamespace) -> bool:
+    """Check: all enabled onfile plugins could work in worker processes"""
+    for onfile_dict in args._plugin_order_onfile_order:
+        onfile_plugin = args._plugins_manager.filter(name=onfile_dict.name).index(0).plugin()
+        if not onfile_plugin.is_show_or_save:
+            continue
+        if not onfile_plugin.check_is_enabled(args):
+            continue
+        if not onfile_plugin.is_parallel_safe:
+            return False
+    return True
+
+
+def _worker_init(argv: List[Any], kwargs: Dict[str, Any], datetime_start: Any) -> None:
+    """Parse args once per worker process"""
+    from autopep8_quotes.args import agrs_parse
+
+    global _worker_args
+    # Warnings were already printed by main process
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_args = agrs_parse(argv, **kwargs)
+    # Use same time as main process, so all workers write into same log files
+    _worker_args._datetime_start = datetime_start
+
+
+def format_file_result(args: SimpleNamespace, name: str, is_thread: bool = False) -> SimpleNamespace:
+    """Run format_file() in worker and return all that main process should know.
+
+    is_thread: stdout is shared by threads, so only output of savers (args._standard_out) is captured.
+    """
+    output = io.StringIO()
+    context = file_context(args, _read_filename=name, _diff_files_count=0, _stats=new_stats(), _profile=new_profile(args),
+                           _file_stats=new_file_stats(args, name))
+    if is_thread:
+        context._standard_out = output
+
+    result = SimpleNamespace()
+    result.name = name
+    result.changed = False
+    result.error = None
+    result.exit_code = None
+
+    try:
+        if is_thread:
+            result.changed = bool(format_file(args=context))
+        else:
+            with contextlib.redirect_stdout(output):
+                try:
+                    result.changed = bool(format_file(args=context))
+                finally:
+                    # Worker process exits without atexit: logs of file are written before result
+                    flush_logs()
+    except IOError as exception:
+        result.error = str(exception)
+    except SystemExit as exception:
+        # --check-hard: main process will exit when it reach this file
+        result.exit_code = exception.code
+
+    result.output = output.getvalue()
+    result.diff_files_count = context._diff_files_count
+    result.stats = dict(context._stats)
+    result.profile = context._profile
+    result.file_stats = context._file_stats
+    return result
+
+
+def _worker_format_file(name: str) -> SimpleNamespace:
+    """Run format_file() in worker process"""
+    return format_file_result(_worker_args, name)
+
+
+def format_files_parallel(args: SimpleNamespace,
+                          filenames: Iterable[str],
+                          jobs: int,
+                          argv: List[Any],
+                          kwargs: Dict[str, Any],
+                          backend: str = "process"
+                          ) -> Iterator[SimpleNamespace]:
+    """Run format_file() on files in process pool (or thread pool).
+
+    Results are yielded in the same order as filenames.
+    Files are submitted while filenames are found, only limited count of them wait in queue.
+    Threads share args of run: state of each file is kept in its file_context.
+    """
+    # Import only when files are formatted in parallel: it is slow
+    from concurrent.futures import Executor
+
+    executor: Executor
+    if backend == "thread":
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=jobs)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=jobs,
+                                       initializer=_worker_init,
+                                       initargs=(argv, kwargs, args._datetime_start))
+
+    futures: Deque[Any] = deque()
+    try:
+        for name in filenames:
+            if backend == "thread":
+                futures.append(executor.submit(format_file_result, args, name, True))
+            else:
+                futures.append(executor.submit(_worker_format_file, name))
+            if len(futures) >= jobs * queue_size_per_job:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        # Don't wait files which are not needed anymore (exit on --check-hard or error)
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,105 @@
+import bisect
+import re
+import sys
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from autopep8_quotes._util._git_diff import run_git
+from autopep8_quotes._util._io import stdout_print
+
+# Header of hunk in `git diff -U0`: @@ -old_start[,old_count] +new_start[,new_count] @@
+hunk_header = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+
+def parse_line_range(value: Any) -> Tuple[int, int]:
+    """Transform "START-END" (numbers of lines from 1, END is included) into tuple"""
+    try:
+        if isinstance(value, (list, tuple)):
+            start, end = value
+        else:
+            start, sep, end = str(value).strip().partition("-")
+            if not sep:
+                end = start
+        start, end = int(start), int(end)
+    except (TypeError, ValueError):
+        raise ValueError(f"Bad line range: {value}")
+    if start < 1 or end < start:
+        raise ValueError(f"Bad line range: {value}")
+    return start, end
+
+
+def parse_line_ranges(values: Any) -> Optional[List[Tuple[int, int]]]:
+    """Transform value of --line-ranges (list or string of config file) into merged ranges, None means all file"""
+    if not values:
+        return None
+    if isinstance(values, str):
+        # Value from config file
+        values = values.replace(",", " ").split()
+    return merge_line_ranges([parse_line_range(x) for x in values])
+
+
+def merge_line_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort ranges and join overlapped and adjacent ones"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def get_staged_hunks(filename: str) -> List[Tuple[int, int]]:
+    """Line ranges of staged version of file which are changed in index (`git diff --cached -U0`)"""
+    ranges = []
+    for match in hunk_header.finditer(run_git(["diff", "--cached", "-U0", "--no-color", "--", filename])):
+        start = int(match.group(1))
+        count = 1 if match.group(2) is None else int(match.group(2))
+        if count:
+            # Hunk with only removed lines has no lines to format
+            ranges.append((start, start + count - 1))
+    return merge_line_ranges(ranges)
+
+
+def has_unstaged_changes(filename: str) -> bool:
+    """Check: working tree file differs from index (git diff -- file)"""
+    return bool(run_git(["diff", "--name-only", "--", filename]).strip())
+
+
+def intersect_line_ranges(ranges1: List[Tuple[int, int]], ranges2: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Lines which are in both merged lists of ranges"""
+    result = []
+    for start1, end1 in ranges1:
+        for start2, end2 in ranges2:
+            start, end = max(start1, start2), min(end1, end2)
+            if start <= end:
+                result.append((start, end))
+    return merge_line_ranges(result)
+
+
+def get_file_line_ranges(args: SimpleNamespace, filename: str) -> Optional[List[Tuple[int, int]]]:
+    """Lines of file which could be changed: --line-ranges and --staged-hunks, None means all file.
+
+    --line-ranges are parsed once by agrs_parse() into args._line_ranges_option.
+    """
+    ranges = getattr(args, "_line_ranges_option", None)
+    if getattr(args, "staged_hunks", False):
+        if has_unstaged_changes(filename):
+            # Hunks are lines of index version: they are shifted in working tree file
+            stdout_print(args, f"staged-hunks: skip file with unstaged changes: {filename}", otype="error")
+            return []
+        hunks = get_staged_hunks(filename)
+        if ranges is None:
+            ranges = hunks
+        else:
+            ranges = intersect_line_ranges(ranges, hunks)
+    return ranges
+
+
+def is_in_line_ranges(ranges: List[Tuple[int, int]], start: int, end: int) -> bool:
+    """Check: lines from start to end (token) are entirely inside one of merged ranges"""
+    i = bisect.bisect_right(ranges, (start, sys.maxsize)) - 1
+    return i >= 0 and ranges[i][0] <= start and end <= ranges[i][1]
@@ -0,0 +1,153 @@
+import atexit
+import os
+import sys
+import threading
+from collections import deque
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# Count of waiting records which wakes up thread
+log_batch_size = 1024
+# Max time (seconds) while records wait in queue
+log_flush_interval = 0.5
+
+
+class log_sink(object):
+    """Writer of log files for whole run: records are appended by background thread.
+
+    Records are added to queue without locks, thread writes them by batches: when batch_size
+    records wait or each flush_interval. Each file is opened once and kept open until close(),
+    records of one batch are written by one call of write() in append mode: records of
+    worker processes are not mixed.
+    """
+
+    def __init__(self, batch_size: int = log_batch_size, flush_interval: float = log_flush_interval) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._reset()
+        self.is_atexit = False
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        """Forked worker process has no thread of parent: records of parent are written by parent"""
+        # Records (filename, text), events of flush() and None to stop thread
+        self.pending: Deque[Any] = deque()
+        self.wakeup = threading.Event()
+        self.handles: Dict[str, Any] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def write(self, filename: str, text: str) -> None:
+        """Add text to the end of file, thread is started on first record"""
+        if self.thread is None:
+            self._start()
+        self.pending.append((filename, text))
+        if len(self.pending) == self.batch_size:
+            self.wakeup.set()
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.thread is not None:
+                return
+            if not self.is_atexit:
+                atexit.register(self.close)
+                self.is_atexit = True
+            self.thread = threading.Thread(target=self._run, name="autopep8_quotes-log", daemon=True)
+            self.thread.start()
+
+    def flush(self) -> None:
+        """Wait until all added records are written"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.pending.append(done)
+        self.wakeup.set()
+        done.wait()
+
+    def close(self) -> None:
+        """Write all records and close files, next record starts new thread"""
+        with self.lock:
+            thread = self.thread
+            if thread is None:
+                return
+            self.pending.append(None)
+            self.wakeup.set()
+            thread.join()
+            self.thread = None
+            # Records which were added by other threads while thread was stopped
+            self._write_pending()
+            self._close_handles()
+
+    def _run(self) -> None:
+        is_closed = False
+        while not is_closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            is_closed = self._write_pending()
+        self._close_handles()
+
+    def _write_pending(self) -> bool:
+        """Write all waiting records, wake up flush() calls and return True if thread should stop"""
+        items = []
+        while self.pending:
+            items.append(self.pending.popleft())
+        try:
+            self._write_batch([item for item in items if isinstance(item, tuple)])
+        except Exception as e:
+            # Thread should live: flush() and close() wait for it
+            sys.stderr.write(f"Can't write logs: {e}\n")
+        finally:
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+        return None in items
+
+    def _write_batch(self, items: List[Tuple[str, str]]) -> None:
+        batches: Dict[str, List[str]] = {}
+        for filename, text in items:
+            batches.setdefault(filename, []).append(text)
+        for filename, texts in batches.items():
+            try:
+                self._get_handle(filename).write("".join(texts).encode("utf-8", "surrogateescape"))
+            except (OSError, UnicodeError) as e:
+                sys.stderr.write(f"Can't write log {filename}: {e}\n")
+
+    def _get_handle(self, filename: str) -> Any:
+        handle = self.handles.get(filename)
+        if handle is None:
+            dirname = os.path.dirname(filename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            # Unbuffered: batch is already joined and it should be written by one call
+            handle = open(filename, "ab", buffering=0)
+            self.handles[filename] = handle
+        return handle
+
+    def _close_handles(self) -> None:
+        for handle in self.handles.values():
+            handle.close()
+        self.handles.clear()
+
+
+# Shared by all files and threads of process
+sink = log_sink()
+
+
+def write_log(filename: str, text: str) -> None:
+    """Add text to the end of log file"""
+    sink.write(filename, text)
+
+
+def flush_logs() -> None:
+    """Wait until all records are written into log files"""
+    sink.flush()
+
+
+def close_logs() -> None:
+    """Write all records and close log files"""
+    sink.close()
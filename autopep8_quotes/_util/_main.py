@@ -1,16 +1,33 @@
 ﻿import io
+import time
 from types import SimpleNamespace
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import tokenize
 import untokenize  # type: ignore
 
+from autopep8_quotes._util import _cache
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._edits import apply_edits
+from autopep8_quotes._util._edits import get_token_edit
+from autopep8_quotes._util._file_stats import file_stats_changed_literals
+from autopep8_quotes._util._file_stats import file_stats_set
+from autopep8_quotes._util._file_stats import file_stats_tokens
 from autopep8_quotes._util._format import get_token_dict
-from autopep8_quotes._util._io import detect_encoding
-from autopep8_quotes._util._io import open_with_encoding
+from autopep8_quotes._util._io import decode_source
+from autopep8_quotes._util._io import read_source_bytes
+from autopep8_quotes._util._line_ranges import get_file_line_ranges
+from autopep8_quotes._util._line_ranges import is_in_line_ranges
+from autopep8_quotes._util._prefilter import is_prefilter_enabled
+from autopep8_quotes._util._prefilter import is_source_clean
+from autopep8_quotes._util._profile import profile_add
+from autopep8_quotes._util._profile import profile_stage
+from autopep8_quotes._util._stats import stats_add
 
 
 def format_file(args: SimpleNamespace) -> Any:
@@ -19,9 +36,11 @@ def format_file(args: SimpleNamespace) -> Any:
     Returns `True` if any changes are needed and they are not being done
     in-place.
 
+    args: file_context of file (args of run for single file), state of file is written into it.
     """
-    args._read_encoding = detect_encoding(args._read_filename)
     args._read_file_need_load = True
+    # Result of format_code() is shared by all plugins until file is changed
+    formatted_source: Optional[str] = None
 
     result: List[Any] = [False]
     if args._dev_debug_level >= 10:
@@ -43,19 +62,55 @@ def format_file(args: SimpleNamespace) -> Any:
         if args._read_file_need_load:
             # On first launch read file
             # If file changed, e.i. --in-place, then need to reload file on next run (data is updated)
-            with open_with_encoding(args._read_filename, encoding=args._read_encoding, mode="rb") as input_file:
-                source = input_file.read()
-                source = source.decode(args._read_encoding)
+            with profile_stage(args, "stage.read"):
+                raw = read_source_bytes(args._read_filename)
+            file_stats_set(args, "bytes", len(raw))
+            with profile_stage(args, "stage.detect_encoding"):
+                loaded = decode_source(raw)
+            args._read_encoding = loaded.encoding
+            args._line_ranges = get_file_line_ranges(args, args._read_filename)
+            # Codes of warnings which were printed while file was formatted
+            args._warning_codes = set()
+            cache_key = _cache.get_cache_key(args, loaded.raw)
+            source = loaded.text
+            args._read_file_need_load = False
+            formatted_source = None
 
-        formatted_source = format_code(
-            source,
-            args=args,
-            filename=args._read_filename
-        )
+        if formatted_source is not None:
+            # Source is not changed by previous plugins: use same result
+            stats_add(args, "format_file.format_passes_saved")
+        elif check_cache(args, cache_key):
+            # File is already formatted under same options
+            stats_add(args, "cache.hit")
+            file_stats_set(args, "cache", "hit")
+            formatted_source = source
+        else:
+            if cache_key is not None:
+                stats_add(args, "cache.miss")
+                file_stats_set(args, "cache", "miss")
+            stats_add(args, "format_file.format_passes")
+            with profile_stage(args, "stage.format"):
+                formatted_source = format_code(
+                    source,
+                    args=args,
+                    filename=args._read_filename
+                )
+            if formatted_source == source and args._line_ranges is None and cache_key is not None and not args._warning_codes:
+                # Lines out of --line-ranges are not checked: file could be not formatted
+                # Warnings of file should be printed on next run too
+                with profile_stage(args, "stage.cache"):
+                    is_saved = _cache.save(args, cache_key)
+                if is_saved:
+                    stats_add(args, "cache.saved")
 
         result = [False]
         func = onfile_plugin.show_or_save
+        start = time.perf_counter()
         res = func(args, source, formatted_source, *onfile_dict.args, **onfile_dict.kwargs)
+        if getattr(args, "_profile", None) is not None:
+            seconds = time.perf_counter() - start
+            profile_add(args, "stage.save", seconds)
+            profile_add(args, f"onfile.{onfile_dict.name}", seconds)
         if res is None:
             pass
         elif isinstance(res, (list, tuple)):
@@ -71,22 +126,58 @@ def format_file(args: SimpleNamespace) -> Any:
     return any(result)
 
 
+def check_cache(args: SimpleNamespace, cache_key: Optional[str]) -> bool:
+    """Check: file is already formatted under same options (cache)"""
+    if cache_key is None:
+        return False
+    with profile_stage(args, "stage.cache"):
+        return _cache.check(args, cache_key)
+
+
 def format_code(source: str, args: SimpleNamespace, filename: str) -> Any:
     """Return source code with quotes unified."""
-    if search_comment_code(source, search="flake8: noqa", filename=filename):
+    if not source:
+        return source
+    if getattr(args, "_line_ranges", None) == []:
+        # No lines to format
+        return source
+    if not getattr(args, "no_prefilter", True):
+        plugins = get_ontoken_plugins(args)
+        with profile_stage(args, "stage.prefilter"):
+            is_clean = is_prefilter_enabled(args, plugins) and is_source_clean(source, args, plugins)
+        if is_clean:
+            # Source already formatted: no need to tokenize
+            stats_add(args, "prefilter.skipped")
+            return source
+    try:
+        with profile_stage(args, "stage.tokenize"):
+            all_tokens = get_tokens(source)
+    except Exception:
+        # no check/reformat file which can't be tokenized
+        return source
+    file_stats_tokens(args, all_tokens)
+    if get_noqa_index(all_tokens).file:
         # no check/reformat entire file
         return source
     try:
-        return _format_code(source, args, filename)
+        formatted = _format_code(source, args, filename, all_tokens=all_tokens)
     except (tokenize.TokenError, IndentationError):  # pragma: no cover
         return source
+    file_stats_changed_literals(args, all_tokens, formatted)
+    return formatted
 
 
-def prepare_tokens(line: str) -> Any:
+def get_tokens(line: str) -> List[tokenize.TokenInfo]:
     sio = io.StringIO(line)
+    return list(tokenize.generate_tokens(sio.readline))
+
+
+def prepare_tokens(line: str) -> Any:
+    return group_tokens_by_line(get_tokens(line))
 
-    all_tokens = list(tokenize.generate_tokens(sio.readline))
 
+def group_tokens_by_line(all_tokens: List[tokenize.TokenInfo]) -> Any:
+    """Yield each token with all tokens which end on the same line"""
     L: Dict[Any, Any] = {}
     for x in all_tokens:
         endsline = x.end[0]
@@ -111,53 +202,165 @@ def search_comment_code(line: Union[str, List[Any]], filename: str, search: str
         all_tokens = line
 
     for token in all_tokens:
-        if token.type == tokenize.COMMENT:
-            t = token.string.lower().strip().strip("#;, \t\n\r")
-            if t == search:
-                return True
-            elif t.endswith(search):
-                return True
-            elif t.startswith(search):
-                return True
+        if is_comment_code(token, search=search):
+            return True
     return False
 
 
-def _format_code(source: str, args: SimpleNamespace, filename: str) -> Any:
-    """Return source code with quotes unified."""
+def is_comment_code(token: tokenize.TokenInfo, search: str = "noqa") -> bool:
+    """Check: token is comment which starts or ends with search"""
+    if token.type != tokenize.COMMENT:
+        return False
+    t = token.string.lower().strip().strip("#;, \t\n\r")
+    return t.startswith(search) or t.endswith(search)
+
+
+def get_noqa_index(all_tokens: List[tokenize.TokenInfo]) -> SimpleNamespace:
+    """Find noqa comments in one scan of tokens.
+
+    file: "flake8: noqa" comment, entire file is not changed.
+    lines: end lines of "noqa" comments, tokens which end on these lines are not changed.
+    """
+    noqa = SimpleNamespace()
+    noqa.file = False
+    noqa.lines = set()
+    for token in all_tokens:
+        if token.type != tokenize.COMMENT:
+            continue
+        if is_comment_code(token, search="flake8: noqa"):
+            noqa.file = True
+        if is_comment_code(token, search="noqa"):
+            noqa.lines.add(token.end[0])
+    return noqa
+
+
+def get_ontoken_plugins(args: SimpleNamespace) -> List[Tuple[SimpleNamespace, Any]]:
+    """Return enabled ontoken plugins in order of run.
+
+    args._ontoken_plugins: plugins which are already resolved (api.Formatter).
+    """
+    resolved = getattr(args, "_ontoken_plugins", None)
+    if resolved is not None:
+        return resolved  # type: ignore
+    plugins = []
+    for ontoken_dict in args._plugin_order_ontoken_order:
+        ontoken_plugin = args._plugins_manager.filter(name=ontoken_dict.name).index(0).plugin()
+        if not ontoken_plugin.is_parse:
+            if args._dev_debug_level >= 25:
+                print("_format_code: not show_or_save plugin", ontoken_dict.name)
+            continue
+
+        if not ontoken_plugin.check_is_enabled(args):
+            continue
+        plugins.append((ontoken_dict, ontoken_plugin))
+    return plugins
+
+
+def get_plugins_passes(args: SimpleNamespace, plugins: List[Tuple[SimpleNamespace, Any]]) -> List[List[Tuple[SimpleNamespace, Any]]]:
+    """Split plugins into passes: on each pass source is tokenized and untokenized once.
+
+    --token-engine=multipass: one pass for each plugin.
+    --token-engine=fused: all plugins on one pass, new pass starts only
+        for plugin which needs tokens of source changed by previous plugins.
+    """
+    passes: List[List[Tuple[SimpleNamespace, Any]]] = []
+    fused = getattr(args, "token_engine", "fused") != "multipass"
+    for ontoken_dict, ontoken_plugin in plugins:
+        if (not passes) or (not fused) or ontoken_plugin.is_fresh_tokens_required:
+            passes.append([])
+        passes[-1].append((ontoken_dict, ontoken_plugin))
+    return passes
+
+
+def _format_code(source: str, args: SimpleNamespace, filename: str, all_tokens: Optional[List[tokenize.TokenInfo]] = None) -> Any:
+    """Return source code with quotes unified.
+
+    all_tokens: tokens of source if they are ready.
+    """
     if not source:
         return source
 
     if args._dev_debug_level >= 20:
         print("_format_code: start", "format_file: ", args._read_filename)
 
-    for ontoken_dict in args._plugin_order_ontoken_order:
-        try:
-            ontoken_plugin = args._plugins_manager.filter(name=ontoken_dict.name).index(0).plugin()
-            if not ontoken_plugin.is_parse:
-                if args._dev_debug_level >= 25:
-                    print("_format_code: not show_or_save plugin", ontoken_dict.name)
-                continue
+    for plugins in get_plugins_passes(args, get_ontoken_plugins(args)):
+        source = _format_code_pass(source, args, filename, plugins, all_tokens=all_tokens)
+        # Source is changed, next pass needs new tokens
+        all_tokens = None
 
-            if not ontoken_plugin.check_is_enabled(args):
-                continue
-            args._modified_tokens = []
-            for token, line_tokens in prepare_tokens(source):
+    return source
+
+
+def _format_code_pass(source: str, args: SimpleNamespace, filename: str, plugins: List[Tuple[SimpleNamespace, Any]],
+                      all_tokens: Optional[List[tokenize.TokenInfo]] = None) -> Any:
+    """Tokenize source once, apply chain of plugins on each token and rebuild source.
+
+    --source-engine=splice: only changed tokens (and edits added by plugins) are replaced in source,
+        plugins which change args._modified_tokens without edits are rebuilt by untokenize.
+    --source-engine=untokenize: source is rebuilt from all tokens.
+    args._line_ranges: only tokens inside these lines are passed to plugins.
+    """
+    if all_tokens is None:
+        with profile_stage(args, "stage.tokenize"):
+            all_tokens = get_tokens(source)
+    noqa = get_noqa_index(all_tokens)
+    line_ranges = getattr(args, "_line_ranges", None)
+    plugins_types = [(ontoken_dict, ontoken_plugin, getattr(ontoken_plugin, "token_types", None)) for ontoken_dict, ontoken_plugin in plugins]
+
+    # State of pass is not written into args: several sources could be formatted at once
+    args = file_context(args)
+    args._modified_tokens = []
+    args._source_edits = []
+    # Tokens added by this function: plugins could change args._modified_tokens
+    added_tokens = []
+    edits = []
+    # --profile: time of each plugin is summed in pass and added once
+    timings: Optional[Dict[str, List[Any]]] = None
+    if getattr(args, "_profile", None) is not None:
+        timings = {ontoken_dict.name: [0, 0.0] for ontoken_dict, _ in plugins}
+    start_transform = time.perf_counter()
+    for token, line_tokens in group_tokens_by_line(all_tokens):
+        original = token
+        if args._dev_debug_level >= 25:
+            print("_format_code: read token", token)
+        if token.end[0] in noqa.lines:
+            pass
+            # no check/reformat line
+        elif line_ranges is not None and not is_in_line_ranges(line_ranges, token.start[0], token.end[0]):
+            pass
+            # token is out of --line-ranges
+        else:
+            for ontoken_dict, ontoken_plugin, token_types in plugins_types:
+                if (token_types is not None) and (token.type not in token_types):
+                    continue
                 if args._dev_debug_level >= 25:
-                    print("_format_code: read token", token)
-                if search_comment_code(line_tokens, search="noqa", filename=filename):
-                    pass
-                    # no check/reformat line
-                else:
-                    if args._dev_debug_level >= 25:
-                        print("_format_code: apply plugin:", ontoken_dict.name)
+                    print("_format_code: apply plugin:", ontoken_dict.name)
 
-                    token_dict = get_token_dict(token.type, token.string, token.start, token.end, token.line, filename)
-                    token = ontoken_plugin.parse(token=token, line_tokens=line_tokens, args=args, token_dict=token_dict,
-                                                 _args=ontoken_dict.args, kwargs=ontoken_dict.kwargs)
-                args._modified_tokens.append((token.type, token.string, token.start, token.end, token.line))
-            source = untokenize.untokenize(args._modified_tokens)
-            del args._modified_tokens
-        except BaseException as e:
-            raise e
+                if timings is not None:
+                    start = time.perf_counter()
+                token_dict = get_token_dict(token.type, token.string, token.start, token.end, token.line, filename)
+                token = ontoken_plugin.parse(token=token, line_tokens=line_tokens, args=args, token_dict=token_dict,
+                                             _args=ontoken_dict.args, kwargs=ontoken_dict.kwargs)
+                if timings is not None:
+                    timings[ontoken_dict.name][0] += 1
+                    timings[ontoken_dict.name][1] += time.perf_counter() - start
+        added_tokens.append((token.type, token.string, token.start, token.end, token.line))
+        args._modified_tokens.append(added_tokens[-1])
+        edit = get_token_edit(original, token)
+        if edit is not None:
+            edits.append(edit)
 
+    if timings is not None:
+        profile_add(args, "stage.transform", time.perf_counter() - start_transform)
+        for name, (calls, seconds) in timings.items():
+            profile_add(args, f"ontoken.{name}", seconds, calls=calls)
+
+    is_tokens_changed = (len(added_tokens) != len(args._modified_tokens)) or \
+        not all(x is y for x, y in zip(added_tokens, args._modified_tokens))
+    if getattr(args, "source_engine", "splice") == "untokenize" or (is_tokens_changed and not args._source_edits):
+        with profile_stage(args, "stage.untokenize"):
+            source = untokenize.untokenize(args._modified_tokens)
+    else:
+        with profile_stage(args, "stage.splice"):
+            source = apply_edits(source, edits + args._source_edits)
     return source
@@ -4,6 +4,8 @@ from types import SimpleNamespace
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Set
 
 import tokenize
 
@@ -29,6 +31,12 @@ class main_formatter(object):
         self.color.reset = col_reset
         self.is_parse = False
         self.is_show_or_save = False
+        # Could be run in worker process (--jobs) with output captured
+        self.is_parallel_safe = True
+        # Needs tokens of source changed by previous plugins (new tokenize pass)
+        self.is_fresh_tokens_required = False
+        # Types of tokens which are passed to parse(), None is all tokens
+        self.token_types: Optional[Set[int]] = None
 
     @abstractmethod
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
@@ -0,0 +1,86 @@
+import re
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+from typing import Tuple
+
+_module = "autopep8_quotes.modules.formater."
+# Plugins which can't change source that passes checks of is_source_clean()
+known_plugins = {f"{_module}normalize_string_quotes",
+                 f"{_module}lowercase_string_prefix",
+                 f"{_module}remove_string_u_prefix",
+                 f"{_module}remove_empty_lines_spaces",
+                 f"{_module}fix_end_file_lines"}
+
+# Start of comment or string literal: word before quote could be prefix or keyword (`if"a"`)
+literal_start = re.compile(r"""#|(?<!\w)(\w*)(\"\"\"|'''|"|')""")
+literal_end = {}
+literal_end['"'] = re.compile(r'(?:[^\\"\r\n]|\\.)*"', re.DOTALL)
+literal_end["'"] = re.compile(r"(?:[^\\'\r\n]|\\.)*'", re.DOTALL)
+literal_end['"""'] = re.compile(r'(?:[^\\]|\\.)*?"""', re.DOTALL)
+literal_end["'''"] = re.compile(r"(?:[^\\]|\\.)*?'''", re.DOTALL)
+comment_end = re.compile(r"[^\r\n]*")
+# Line with spaces only (without end of line)
+spaces_line = re.compile(r"^[^\S\n]*[^\S\r\n][^\S\n]*$", re.MULTILINE)
+# Last line ends with "\r\n" without spaces before it
+good_file_end = re.compile(r"\S\r\n\Z")
+
+
+def is_prefilter_enabled(args: SimpleNamespace, plugins: List[Tuple[SimpleNamespace, Any]]) -> bool:
+    """Check: source could be checked without tokenize.
+
+    Only known plugins are enabled and there are no logs of each string.
+    """
+    for key in ["debug", "save_values_to_file", "nsq_log_transform"]:
+        if getattr(args, key, False):
+            return False
+    return all(type(ontoken_plugin).__module__ in known_plugins for ontoken_dict, ontoken_plugin in plugins)
+
+
+def is_source_clean(source: str, args: SimpleNamespace, plugins: List[Tuple[SimpleNamespace, Any]]) -> bool:
+    """Prove by scan of text that plugins will not change source.
+
+    False means that source could need changes (or scan is not sure).
+    """
+    enabled = {type(ontoken_plugin).__module__[len(_module):] for ontoken_dict, ontoken_plugin in plugins}
+
+    if "fix_end_file_lines" in enabled and not good_file_end.search(source):
+        return False
+    if "remove_empty_lines_spaces" in enabled and spaces_line.search(source):
+        return False
+
+    is_strings = {"normalize_string_quotes", "lowercase_string_prefix", "remove_string_u_prefix"} & enabled
+    if not is_strings:
+        return True
+    pos = 0
+    while True:
+        match = literal_start.search(source, pos)
+        if match is None:
+            return True
+        if match.group(0) == "#":
+            pos = comment_end.match(source, match.end()).end()  # type: ignore
+            continue
+
+        name, quote = match.group(1), match.group(2)
+        end = literal_end[quote].match(source, match.end())
+        if end is None:
+            # Unclosed string: let tokenize decide
+            return False
+        pos = end.end()
+        if name.strip("rbufRBUF"):
+            # Keyword or name before string, not prefix
+            name = ""
+        body = source[match.end():end.end() - len(quote)]
+
+        if "f" in name.lower() and ("'" in body or '"' in body):
+            # Python 3.12+: quotes inside f-string could be other strings
+            return False
+        if "lowercase_string_prefix" in enabled and not name.islower() and name:
+            return False
+        if "remove_string_u_prefix" in enabled and "u" in name.lower():
+            return False
+        if "normalize_string_quotes" in enabled:
+            if quote not in [args.inline_quotes, args.multiline_quotes]:
+                return False
+            if "\\'" in body or '\\"' in body:
+                return False
@@ -0,0 +1,69 @@
+import contextlib
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from autopep8_quotes._util._io import stdout_print
+
+# Timings are shared by threads which format files (--jobs-backend=thread, api.Formatter)
+profile_lock = threading.Lock()
+
+
+def new_profile(args: SimpleNamespace) -> Optional[Dict[str, List[Any]]]:
+    """Return empty timings (name => [calls, seconds]) if --profile or --stats-json is enabled, otherwise None"""
+    if not (getattr(args, "profile", False) or getattr(args, "stats_json", None)):
+        return None
+    return {}
+
+
+def profile_add(args: SimpleNamespace, name: str, seconds: float, calls: int = 1) -> None:
+    """Add time of calls, do nothing if --profile is disabled"""
+    profile = getattr(args, "_profile", None)
+    if profile is None:
+        return
+    with profile_lock:
+        entry = profile.setdefault(name, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+
+
+def profile_merge(args: SimpleNamespace, profile: Optional[Dict[str, List[Any]]]) -> None:
+    """Add timings from worker process or thread"""
+    for name, (calls, seconds) in (profile or {}).items():
+        profile_add(args, name, seconds, calls=calls)
+
+
+@contextlib.contextmanager
+def profile_stage(args: SimpleNamespace, name: str) -> Iterator[None]:
+    """Measure time of block"""
+    if getattr(args, "_profile", None) is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile_add(args, name, time.perf_counter() - start)
+
+
+def print_profile(args: SimpleNamespace) -> None:
+    """Print timings sorted by total time: table or json (--profile-format)"""
+    profile = args._profile or {}
+    names = sorted(profile, key=lambda name: (-profile[name][1], name))
+    if args.profile_format == "json":
+        data = {name: {"calls": profile[name][0], "seconds": profile[name][1]} for name in names}
+        stdout_print(args, json.dumps(data), otype="ok")
+        return
+
+    stdout_print(args, "Profile:", otype="ok")
+    stdout_print(args, f"    {'name':<50} {'calls':>10} {'total, s':>10} {'per call, us':>14}", otype="ok")
+    for name in names:
+        calls, seconds = profile[name]
+        per_call = seconds / calls * 1e6 if calls else 0.0
+        stdout_print(args, f"    {name:<50} {calls:>10} {seconds:>10.4f} {per_call:>14.2f}", otype="ok")
@@ -0,0 +1,51 @@
+import threading
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+
+from autopep8_quotes._util._io import stdout_print
+
+# Counters are shared by threads which format files (--jobs-backend=thread, api.Formatter)
+stats_lock = threading.Lock()
+
+
+def new_stats() -> "Counter[str]":
+    """Return empty counters of run (cache hits, reused formatting and etc.)"""
+    return Counter()
+
+
+def stats_add(args: SimpleNamespace, name: str, value: int = 1) -> None:
+    """Increase counter, do nothing if args has no counters (format_code() without agrs_parse())"""
+    stats = getattr(args, "_stats", None)
+    if stats is not None:
+        with stats_lock:
+            stats[name] += value
+
+
+def stats_merge(args: SimpleNamespace, stats: Dict[str, Any]) -> None:
+    """Add counters from worker process or thread"""
+    with stats_lock:
+        args._stats.update(stats)
+
+
+def get_hit_rates(stats: Dict[str, Any]) -> Dict[str, float]:
+    """Hit rate of each cache which has counters `<cache>.hit` and `<cache>.miss`"""
+    rates = {}
+    for name in stats:
+        if not name.endswith(".hit"):
+            continue
+        cache = name[:-len(".hit")]
+        total = stats[name] + stats.get(f"{cache}.miss", 0)
+        if total:
+            rates[f"{cache}.hit_rate"] = stats[name] / total
+    return rates
+
+
+def print_stats(args: SimpleNamespace) -> None:
+    """Print all counters and hit rates of caches sorted by name"""
+    stdout_print(args, "Stats:", otype="ok")
+    lines = {name: str(value) for name, value in args._stats.items()}
+    lines.update({name: f"{value:.1%}" for name, value in get_hit_rates(args._stats).items()})
+    for name in sorted(lines):
+        stdout_print(args, f"    {name}: {lines[name]}", otype="ok")
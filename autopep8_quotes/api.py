@@ -0,0 +1,55 @@
+"""Format source code in memory without files and parse of command line on each call.
+
+    from autopep8_quotes import Formatter
+
+    formatter = Formatter(inline_quotes="'")
+    result = formatter.format_source('x = "a"\n')
+    result.changed, result.formatted
+"""
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+from typing import Optional
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes._util._main import get_ontoken_plugins
+
+
+class Formatter(object):
+    """Options, plugins and their order are resolved once and reused by each call.
+
+    Calls could be made from several threads: state of each call is kept in its own context.
+
+    argv: options as in command line (e.g. ["--config-file", "setup.cfg"]).
+    options: values of options by their names in args (e.g. inline_quotes="'").
+    """
+
+    def __init__(self, argv: Optional[List[str]] = None, **options: Any) -> None:
+        from autopep8_quotes.args import agrs_parse
+
+        args = agrs_parse(list(argv or []), _standard_out="sys.stdout", _standard_error="sys.stderr")
+        for key in options:
+            if key.startswith("_") or key not in args.__dict__:
+                raise TypeError(f"Unknown option: {key}")
+        if options:
+            # Options are passed into agrs_parse: state of run (cache, profile, enabled plugins) depends on them
+            args = agrs_parse(list(argv or []), _standard_out="sys.stdout", _standard_error="sys.stderr", **options)
+        args._ontoken_plugins = get_ontoken_plugins(args)
+        self.args = args
+
+    def format_source(self, source: str, filename: str = "<string>") -> SimpleNamespace:
+        """Format source code.
+
+        Returns result with attributes: source, formatted, changed.
+        """
+        result = SimpleNamespace()
+        result.source = source
+        context = file_context(self.args, _read_filename=filename)
+        result.formatted = format_code(source, args=context, filename=filename)
+        result.changed = result.formatted != source
+        return result
+
+    def check_source(self, source: str, filename: str = "<string>") -> bool:
+        """Check: source code is already formatted"""
+        return not self.format_source(source, filename=filename).changed
@@ -15,8 +15,13 @@ from autopep8_quotes import __doc__
 from autopep8_quotes import __title_name__
 from autopep8_quotes import __version__
 from autopep8_quotes._util import _args as _util_args
+from autopep8_quotes._util import _cache as _util_cache
 from autopep8_quotes._util._args import str2bool_dict
 from autopep8_quotes._util._io import stdout_print
+from autopep8_quotes._util._jobs import jobs_type
+from autopep8_quotes._util._line_ranges import parse_line_ranges
+from autopep8_quotes._util._profile import new_profile
+from autopep8_quotes._util._stats import new_stats
 
 LOG = logging.getLogger(__name__)
 
@@ -53,12 +58,32 @@ def agrs_parse(argv: List[Any], *_args: Any, **kwargs: Any) -> SimpleNamespace:
 
     defaults["exit_zero"] = False
     defaults["print_files"] = False
+    defaults["print_stats"] = False
+    defaults["profile"] = False
+    defaults["profile_format"] = "table"
+    defaults["stats_json"] = ""
     defaults["print_disable"] = False
     defaults["debug"] = False
     defaults["show_args"] = False
     defaults["save_values_to_file"] = False
     defaults["recursive"] = False
+    defaults["jobs"] = "1"
+    defaults["jobs_backend"] = "process"
+    defaults["cache_dir"] = ""
+    defaults["no_cache"] = False
+    defaults["cache_max_entries"] = 100000
     defaults["read_files_matching_pattern"] = [r".*\.py$"]
+    defaults["exclude"] = ".svn,CVS,.bzr,.hg,.git,__pycache__,.tox,.nox,.eggs,*.egg"
+    defaults["extend_exclude"] = ""
+    defaults["gitignore"] = False
+    defaults["since"] = ""
+    defaults["staged"] = False
+    defaults["line_ranges"] = None
+    defaults["staged_hunks"] = False
+    defaults["token_engine"] = "fused"
+    defaults["source_engine"] = "splice"
+    defaults["no_prefilter"] = False
+    defaults["git_filter_process"] = False
 
     # Apply on complete file, then next module
     # 1. Check all file: is there any need of changes
@@ -134,14 +159,71 @@ def agrs_parse(argv: List[Any], *_args: Any, **kwargs: Any) -> SimpleNamespace:
                         help="Disable print msg")
     parser.add_argument("-r", "--recursive", action="store_true",
                         help="Drill down directories recursively")
+    parser.add_argument("-j", "--jobs", type=jobs_type,
+                        help="Number of parallel worker processes to format files. "
+                        "Use 'auto' to run one worker per CPU. ")
+    parser.add_argument("--jobs-backend", choices=["process", "thread"],
+                        help="How to run --jobs workers. "
+                        "process: pool of processes. "
+                        "thread: pool of threads, it is faster on free-threaded Python builds and on slow (network) file systems. ")
+    parser.add_argument("--cache-dir", type=str, metavar="DIR",
+                        help="Location of cache with already formatted files. "
+                        "Empty value means user cache directory. ")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read and write cache with already formatted files")
+    parser.add_argument("--cache-max-entries", type=int,
+                        help="Max count of files in cache, least recently used are removed. ")
     parser.add_argument("--print-files", action="store_true",
                         help="Print parsed files")
+    parser.add_argument("--print-stats", action="store_true",
+                        help="Print counters of run: cache hits, reused results of formatting and etc.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print time and count of calls of each plugin and stage of run (read, tokenize, transform and etc.)")
+    parser.add_argument("--profile-format", choices=["table", "json"],
+                        help="Format of --profile: table sorted by time or json. ")
+    parser.add_argument("--stats-json", type=str, metavar="FILE",
+                        help="Write statistics of each file into FILE (json lines): path, bytes, tokens, string tokens, "
+                        "changed literals, counts of normalize_string_quotes results, time of stages and cache hit or miss. ")
     parser.add_argument("--exit-zero", action="store_true",
                         help='Exit with status code "0" even if there are errors.')
 
     parser.add_argument("--read-files-matching-pattern",
                         type=str, nargs="+",
                         help="Check only for filenames matching the pattern.")
+    parser.add_argument("--exclude", type=str, metavar="PATTERNS",
+                        help="Comma-separated list of files or directories to exclude, directories are not scanned. "
+                        "Pattern with '/' matches path, other patterns match name. ")
+    parser.add_argument("--extend-exclude", type=str, metavar="PATTERNS",
+                        help="Comma-separated list of files or directories to add to --exclude. ")
+    parser.add_argument("--gitignore", action="store_true",
+                        help="Do not format files and do not scan directories which are ignored by .gitignore files. ")
+    parser.add_argument("--since", type=str, metavar="REV",
+                        help="Format only files changed since git revision (git diff --name-only REV), "
+                        "--files limit search of changed files. ")
+    parser.add_argument("--staged", action="store_true",
+                        help="Format only files staged in git index (git diff --cached --name-only), "
+                        "--files limit search of changed files. ")
+    parser.add_argument("--line-ranges", type=str, nargs="+", metavar="START-END",
+                        help="Format only strings inside these lines of each file (numbers from 1, END is included). ")
+    parser.add_argument("--staged-hunks", action="store_true",
+                        help="Format only lines of files changed in git index (git diff --cached -U0), implies --staged. "
+                        "Files with unstaged changes are skipped: lines of index are shifted in working tree. ")
+
+    parser.add_argument("--token-engine", choices=["fused", "multipass"],
+                        help="How to apply ontoken plugins. "
+                        "fused: tokenize source once and apply all plugins on each token. "
+                        "multipass: tokenize and untokenize source for each plugin. ")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Tokenize all files. By default files which are proved to be formatted "
+                        "by fast scan of text are not tokenized. ")
+    parser.add_argument("--source-engine", choices=["splice", "untokenize"],
+                        help="How to get source from changed tokens. "
+                        "splice: replace only changed parts of source. "
+                        "untokenize: rebuild source from all tokens. ")
+
+    parser.add_argument("--git-filter-process", action="store_true",
+                        help="Run as long-running git filter (filter.<driver>.process in git config): "
+                        "read files from git by pkt-line protocol on stdin and write formatted files to stdout. ")
 
     # Define order when run functions
     parser.add_argument("--plugin-order-onfile-first", type=str,
@@ -179,6 +261,12 @@ def agrs_parse(argv: List[Any], *_args: Any, **kwargs: Any) -> SimpleNamespace:
     # Transform string values into boolean
     str2bool_dict(defaults, args.__dict__)
 
+    # Parse --line-ranges once for all files: bad value is error of usage
+    try:
+        args._line_ranges_option = parse_line_ranges(args.line_ranges)
+    except ValueError as e:
+        parser.error(f"argument --line-ranges: {e}")
+
     # Transform string values into list of order startup
     all_plugins = [x.name for x in plugins]
 
@@ -210,6 +298,14 @@ def agrs_parse(argv: List[Any], *_args: Any, **kwargs: Any) -> SimpleNamespace:
 
     # Add some basic values
     args._datetime_start = datetime.datetime.now()
+    args._stats = new_stats()
+    args._profile = new_profile(args)
+
+    # Cache of already formatted files depends on formatting options
+    args._cache_dir = _util_cache.get_cache_dir(args)
+    args._cache_config_hash = None
+    if _util_cache.is_cache_enabled(args):
+        args._cache_config_hash = _util_cache.get_config_hash(args)
 
     if args.show_args:
         stdout_print(args, str(args), otype="ok")
@@ -5,6 +5,7 @@ from typing import List
 
 import tokenize
 
+from autopep8_quotes._util._edits import add_edit
 from autopep8_quotes._util._modules import main_formatter
 
 
@@ -12,6 +13,7 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_parse = True
+        self.token_types = {tokenize.ENDMARKER}
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--fix-end-file-lines", action="store_true",
@@ -35,6 +37,10 @@ class formatter(main_formatter):
                         break
                     args._modified_tokens.pop()
 
+                # Same change for splice of source: all after last token is replaced,
+                # row after ENDMARKER is end of source (spaces after last new line are replaced too)
+                last_end = args._modified_tokens[-1][3] if args._modified_tokens else (1, 0)
+                add_edit(args, last_end, (token.end[0] + 1, 0), "\r\n")
                 args._modified_tokens.append((tokenize.NEWLINE, "\r\n", token.start, token.end, token.line))
         return token
 
@@ -13,6 +13,7 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_parse = True
+        self.token_types = {tokenize.STRING}
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--lowercase-string-prefix", action="store_true",
@@ -1,17 +1,43 @@
 ﻿import re
+import threading
+from collections import OrderedDict
 from enum import Enum
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import tokenize
 
+from autopep8_quotes._util._file_stats import file_stats_count
 from autopep8_quotes._util._format import isevaluatable
 from autopep8_quotes._util._format import save_values_to_file
 from autopep8_quotes._util._format import sub_twice
 from autopep8_quotes._util._modules import main_formatter
+from autopep8_quotes._util._stats import stats_add
+
+# Longer bodies are not checked by bruteforce_body(): it calls ast.literal_eval on each symbol
+bruteforce_max_length = 1000
+# Max count of strings in memo of results (same literals are repeated in files many times)
+memo_max_size = 65536
+
+quotes = {}
+quotes["'''"] = '"""'
+quotes['"""'] = "'''"
+quotes["'"] = '"'
+quotes['"'] = "'"
+
+fstring_expression = re.compile(
+    r"""
+    (?:[^{]|^)\{  # start of the string or a non-{ followed by a single {
+        ([^{].*?)  # contents of the brackets except if begins with {{
+    \}(?:[^}]|$)  # A } followed by end of the string or a non-}
+    """,
+    re.VERBOSE,
+)
 
 
 class quotes_codes(Enum):
@@ -30,10 +56,56 @@ class quotes_codes(Enum):
     original__empty = 17
 
 
+@lru_cache(maxsize=None)
+def get_quote_regex(orig_quote: str, new_quote: str) -> SimpleNamespace:
+    """Compiled regexes for pair of quotes, they are compiled once per pair"""
+    regex = SimpleNamespace()
+    regex.unescaped_new_quote = re.compile(rf"(([^\\]|^)(\\\\)*){new_quote}")
+    regex.escaped_new_quote = re.compile(rf"([^\\]|^)\\((?:\\\\)*){new_quote}")
+    regex.escaped_orig_quote = re.compile(rf"([^\\]|^)\\((?:\\\\)*){orig_quote}")
+
+    regex.escaped_quote_single_el_v1 = re.compile(rf"([^\\]|^)\\((?:\\\\)*){new_quote[0]}")
+    regex.escaped_quote_single_el_v2 = re.compile(rf"([^\\]|^)\\((?:\\\\)*){quotes[new_quote[0]][0]}")
+    return regex
+
+
+class memo_cache(object):
+    """Least recently used results of normalization: (string, quote options) => (string, code)"""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.data: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        # Files could be formatted in threads
+        self.lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Any]:
+        with self.lock:
+            value = self.data.get(key)
+            if value is not None:
+                self.data.move_to_end(key)
+            return value
+
+    def set(self, key: Tuple[str, str, str], value: Any) -> None:
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+
+
+# Shared by all instances of plugin: new instance is created for every file
+memo = memo_cache(memo_max_size)
+
+
 class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_parse = True
+        self.token_types = {tokenize.STRING}
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--normalize-string-quotes", "--nsq",
@@ -85,12 +157,6 @@ class formatter(main_formatter):
         def parse(leaf: str, args: SimpleNamespace, token_dict: Dict[str, Any], change_quote: bool = False) -> Tuple[str, quotes_codes]:
             body_quoted = leaf.lstrip("furbFURB")
 
-            quotes = {}
-            quotes["'''"] = '"""'
-            quotes['"""'] = "'''"
-            quotes["'"] = '"'
-            quotes['"'] = "'"
-
             if (body_quoted[:3] == body_quoted[-3:]) and len(body_quoted) >= 6:
                 if body_quoted[:3] == args.multiline_quotes:
                     orig_quote = args.multiline_quotes
@@ -120,19 +186,14 @@ class formatter(main_formatter):
                 return leaf, quotes_codes.original__cant_find_first_quote
 
             prefix = leaf[:first_quote_pos]
-            unescaped_new_quote = re.compile(rf"(([^\\]|^)(\\\\)*){new_quote}")
-            escaped_new_quote = re.compile(rf"([^\\]|^)\\((?:\\\\)*){new_quote}")
-            escaped_orig_quote = re.compile(rf"([^\\]|^)\\((?:\\\\)*){orig_quote}")
-
-            escaped_quote_single_el_v1 = re.compile(rf"([^\\]|^)\\((?:\\\\)*){new_quote[0]}")
-            escaped_quote_single_el_v2 = re.compile(rf"([^\\]|^)\\((?:\\\\)*){quotes[new_quote[0]][0]}")
+            regex = get_quote_regex(orig_quote, new_quote)
 
             body = leaf[first_quote_pos + len(orig_quote): -len(orig_quote)]
             # Save body for future checks
             old_body = body
 
             if "r" in prefix.casefold():
-                if unescaped_new_quote.search(body):
+                if regex.unescaped_new_quote.search(body):
                     # There's at least one unescaped new_quote in this raw string
                     # so converting is impossible
                     if args.nsq_log_transform:
@@ -143,27 +204,19 @@ class formatter(main_formatter):
                 new_body = body
             else:
                 # remove unnecessary escapes
-                new_body = sub_twice(escaped_new_quote, rf"\1\2{new_quote}", body)
+                new_body = sub_twice(regex.escaped_new_quote, rf"\1\2{new_quote}", body)
                 if len(new_quote) == 3:
-                    new_body = sub_twice(escaped_quote_single_el_v1, rf"\1\2{new_quote[0]}", new_body)
-                    new_body = sub_twice(escaped_quote_single_el_v2, rf"\1\2{quotes[new_quote[0]][0]}", new_body)
+                    new_body = sub_twice(regex.escaped_quote_single_el_v1, rf"\1\2{new_quote[0]}", new_body)
+                    new_body = sub_twice(regex.escaped_quote_single_el_v2, rf"\1\2{quotes[new_quote[0]][0]}", new_body)
 
                 if body != new_body:
                     # Consider the string without unnecessary escapes as the original
                     return self.check_string(leaf, prefix, old_body, new_body, orig_quote, new_quote, args=args, token_dict=token_dict)
-                new_body = sub_twice(escaped_orig_quote, rf"\1\2{orig_quote}", new_body)
-                new_body = sub_twice(unescaped_new_quote, rf"\1\\{new_quote}", new_body)
+                new_body = sub_twice(regex.escaped_orig_quote, rf"\1\2{orig_quote}", new_body)
+                new_body = sub_twice(regex.unescaped_new_quote, rf"\1\\{new_quote}", new_body)
 
             if "f" in prefix.casefold():
-                matches = re.findall(
-                    r"""
-                    (?:[^{]|^)\{  # start of the string or a non-{ followed by a single {
-                        ([^{].*?)  # contents of the brackets except if begins with {{
-                    \}(?:[^}]|$)  # A } followed by end of the string or a non-}
-                    """,
-                    new_body,
-                    re.VERBOSE,
-                )
+                matches = fstring_expression.findall(new_body)
                 for m in matches:
                     if "\\" in str(m):
                         # Do not introduce backslashes in interpolated expressions
@@ -189,6 +242,15 @@ class formatter(main_formatter):
             return self.check_string(leaf, prefix, old_body, new_body, orig_quote, new_quote, args=args, token_dict=token_dict)
 
         if args.normalize_string_quotes:
+            # Plugin has no side effects only without logs and debug
+            is_memo = not (args.debug or args.nsq_log_transform)
+            memo_key = (token.string, args.inline_quotes, args.multiline_quotes)
+            memo_value = memo.get(memo_key) if is_memo else None
+            if memo_value is not None:
+                stats_add(args, "nsq.memo.hit")
+                file_stats_count(args, "quotes_codes", memo_value[1].name)
+                return tokenize.TokenInfo(type=token.type, string=memo_value[0], start=token.start, end=token.end, line=token.line)
+
             result_string, code = parse(token.string, args=args, token_dict=token_dict, change_quote=False)
             if code == quotes_codes.changed__quote_bruteforce:
                 # Try to change quote """ => ''' and vice versa
@@ -196,6 +258,17 @@ class formatter(main_formatter):
                 if code_v2 in [quotes_codes.changed__old_quote, quotes_codes.changed__new_quote]:
                     result_string, code = result_string_v2, code_v2
 
+            if is_memo:
+                stats_add(args, "nsq.memo.miss")
+                # Bad strings print warnings: they should be printed for each string
+                if code not in [quotes_codes.original__bad_value, quotes_codes.original__cant_transform]:
+                    memo.set(memo_key, (result_string, code))
+            file_stats_count(args, "quotes_codes", code.name)
+            # File with warnings is not cached: warnings should be printed on each run
+            warning_codes = getattr(args, "_warning_codes", None)
+            if warning_codes is not None and code in [quotes_codes.original__bad_value, quotes_codes.original__cant_transform]:
+                warning_codes.add(code.name)
+
             if args.debug:
                 self.stdout_print(args, "normalize_string_quotes: ")
                 self.stdout_print(args, "    code:           {code}")
@@ -210,6 +283,47 @@ class formatter(main_formatter):
             save_values_to_file(args=args, input_list=[token_dict], name="nsq-leaf_None")
         return token
 
+    def escape_body(self, body: str, prefix: str, quote: str) -> str:
+        """Escape quotes in body in one pass to get new_body.
+
+        Linear version of bruteforce_body(): escape sequences are copied as is,
+        quote symbol is escaped when it could close the string.
+        """
+        if "f" in prefix.casefold():
+            # ast.literal_eval can't evaluate f-strings,
+            # so bruteforce_body() never adds any symbol of f-string
+            return f"{prefix}{quote}{quote}"
+
+        new_body = []
+        delim = "\\"
+        # Count of unescaped quote symbols in a row
+        in_row = 0
+        i = 0
+        L = len(body)
+        while i < L:
+            char = body[i]
+            if char == delim:
+                # Escape sequence: copy backslash and escaped symbol
+                new_body.append(body[i:i + 2])
+                in_row = 0
+                i += 2
+                continue
+
+            if char != quote[0]:
+                new_body.append(char)
+                in_row = 0
+            elif (len(quote) == 1) or (i == L - 1) or (in_row == 2):
+                # Single quote, last symbol or third quote symbol in a row closes the string
+                new_body.append(delim + char)
+                in_row = 0
+            else:
+                new_body.append(char)
+                in_row += 1
+            i += 1
+
+        # Result line. It could be not normal
+        return f"{prefix}{quote}{''.join(new_body)}{quote}"
+
     def bruteforce_body(self, body: str, prefix: str, quote: str) -> str:
         """Escape symbol by symbol to get new_body"""
         new_body = ""
@@ -273,7 +387,7 @@ class formatter(main_formatter):
             self.stdout_print(args, "    " + self.color.red + f"Position:   {token_dict['pos']}" + self.color.reset)
             self.stdout_print(args, "    " + self.color.red + f"String:     {token_dict['token_string']}" + self.color.reset)
             self.stdout_print(args, "")
-            if args.nsq_log_transforn:
+            if args.nsq_log_transform:
                 save_values_to_file(args=args, input_list=[token_dict], name="nsq-original__bad_value")
             return original, quotes_codes.original__bad_value
 
@@ -295,8 +409,12 @@ class formatter(main_formatter):
                 save_values_to_file(args=args, input_list=[token_dict], name="nsq-changed__old_quote")
             return v2, quotes_codes.changed__old_quote
 
-        v3 = self.bruteforce_body(new_body, prefix, new_quote)
+        v3 = self.escape_body(new_body, prefix, new_quote)
         v3_res = isevaluatable(v3, prefix)
+        if not (v3_res[0] and (v3_res[1] == v0_res[1])) and len(new_body) <= bruteforce_max_length:
+            # Verify by escaping symbol by symbol
+            v3 = self.bruteforce_body(new_body, prefix, new_quote)
+            v3_res = isevaluatable(v3, prefix)
         if v3_res[0] and (v3_res[1] == v0_res[1]):
             if args.debug:
                 self.stdout_print(args, self.color.red + f"Return v3: {v3}" + self.color.reset)
@@ -12,6 +12,7 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_parse = True
+        self.token_types = {tokenize.NL}
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--remove-empty-lines-spaces", action="store_true",
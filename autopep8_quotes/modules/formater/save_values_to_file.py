@@ -13,6 +13,8 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_parse = True
+        # Save positions of tokens in changed source
+        self.is_fresh_tokens_required = True
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--save-values-to-file", action="store_true",
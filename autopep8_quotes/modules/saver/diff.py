@@ -1,5 +1,4 @@
-﻿import difflib
-from types import SimpleNamespace
+﻿from types import SimpleNamespace
 from typing import Any
 from typing import Dict
 
@@ -34,6 +33,7 @@ class formatter(main_formatter):
             if args.diff:
                 if args.diff_count:
                     args._diff_files_count += 1
+                import difflib
                 diff = difflib.unified_diff(
                     source.splitlines(),
                     formatted_source.splitlines(),
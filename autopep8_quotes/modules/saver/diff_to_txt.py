@@ -1,5 +1,4 @@
-﻿import difflib
-import os
+﻿import os
 from types import SimpleNamespace
 from typing import Any
 from typing import Dict
@@ -11,6 +10,8 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_show_or_save = True
+        # All files append into one log: diffs of workers would be mixed and out of order of files
+        self.is_parallel_safe = False
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("-t", "--diff-to-txt", action="store_true",
@@ -34,6 +35,7 @@ class formatter(main_formatter):
             if args.diff_to_txt:
                 if args.diff_to_txt_count:
                     args._diff_files_count += 1
+                import difflib
                 diff = difflib.unified_diff(
                     source.splitlines(),
                     formatted_source.splitlines(),
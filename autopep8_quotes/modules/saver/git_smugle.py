@@ -11,6 +11,8 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_show_or_save = True
+        # Writes directly into sys.stdout.buffer
+        self.is_parallel_safe = False
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("-gs", "--git-smugle", action="store_true",
@@ -1,5 +1,4 @@
-﻿import difflib
-import io
+﻿import io
 import sys
 from types import SimpleNamespace
 from typing import Any
@@ -12,6 +11,8 @@ class formatter(main_formatter):
     def __init__(self) -> None:
         super().__init__()
         self.is_show_or_save = True
+        # Writes directly into sys.stdout.buffer
+        self.is_parallel_safe = False
 
     def add_arguments(self, parser: Any, *_args: Any, **kwargs: Any) -> None:
         parser.add_argument("--git-smugle-diff", action="store_true",
@@ -36,6 +37,7 @@ class formatter(main_formatter):
             if args.git_smugle_diff_count:
                 args._diff_files_count += 1
 
+            import difflib
             diff = difflib.unified_diff(
                 source.splitlines(),
                 formatted_source.splitlines(),
@@ -0,0 +1,71 @@
+
+from typing import Any
+
+import pytest  # type: ignore
+
+import autopep8_quotes
+from autopep8_quotes.api import Formatter
+
+
+@pytest.mark.api  # type: ignore
+def test_formatter__format_source() -> None:
+    formatter = Formatter()
+    result = formatter.format_source("x = 'a'\r\n")
+    assert result.changed
+    assert result.source == "x = 'a'\r\n"
+    assert result.formatted == 'x = "a"\r\n'
+
+    result = formatter.format_source(result.formatted)
+    assert not result.changed
+    assert result.formatted is result.source
+
+    assert formatter.check_source('x = "a"\r\n')
+    assert not formatter.check_source("x = 'a'\r\n")
+
+
+@pytest.mark.api  # type: ignore
+def test_formatter__options() -> None:
+    formatter = Formatter(inline_quotes="'")
+    assert formatter.format_source('x = "a"\r\n').formatted == "x = 'a'\r\n"
+
+    formatter = Formatter(["--inline-quotes", "'"])
+    assert formatter.format_source('x = "a"\r\n').formatted == "x = 'a'\r\n"
+
+    # Disabled plugins are not resolved
+    formatter = Formatter(normalize_string_quotes=False)
+    assert formatter.format_source("x = u'a'\r\n").formatted == "x = 'a'\r\n"
+
+    with pytest.raises(TypeError):
+        Formatter(not_exist_option=True)
+    with pytest.raises(TypeError):
+        Formatter(_plugins_manager=None)
+
+
+@pytest.mark.api  # type: ignore
+def test_formatter__derived_options(tmp_path: Any) -> None:
+    # State of run is computed from options
+    formatter = Formatter(profile=True)
+    formatter.format_source("x = 'a'\r\n")
+    assert formatter.args._profile["stage.tokenize"][0] == 1
+
+    formatter = Formatter(no_cache=True)
+    assert formatter.args._cache_config_hash is None
+    formatter = Formatter(cache_dir=str(tmp_path))
+    assert formatter.args._cache_dir == str(tmp_path)
+    assert formatter.args._cache_config_hash is not None
+
+
+@pytest.mark.api  # type: ignore
+def test_formatter__plugins_resolved_once() -> None:
+    formatter = Formatter()
+    plugins = formatter.args._ontoken_plugins
+    formatter.format_source("x = 'a'\r\n")
+    formatter.format_source("y = 'b'\r\n")
+    assert formatter.args._ontoken_plugins is plugins
+
+
+@pytest.mark.api  # type: ignore
+def test_formatter__lazy_import() -> None:
+    assert autopep8_quotes.Formatter is Formatter
+    with pytest.raises(AttributeError):
+        autopep8_quotes.not_exist  # type: ignore
@@ -165,3 +165,45 @@ def test__main_exit_check_hard(standard_out: Any, standard_error: Any) -> None:
     errcode = f"Error: --check-hard: need changes in file: {fname}"
     assert pytest_wrapped_e.value.code == errcode
     remove_file(fname)
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_jobs(standard_out: Any, standard_error: Any) -> None:
+    fname = "tests/good/"
+
+    # Same exit code and counters as serial run
+    for jobs in ["1", "2", "auto"]:
+        for backend in ["process", "thread"]:
+            args = ["--check-soft", "--check-soft-count", "--recursive", f"--jobs={jobs}", f"--jobs-backend={backend}", f"--files={fname}"]
+            res = _main(args=args, standard_out=standard_out, standard_error=standard_error)
+            assert res == 1
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_jobs_check_hard(standard_out: Any, standard_error: Any) -> None:
+    fname = "tests/good/tests_changeable_string_JOBS.py"
+    fname_formatted = "tests/good/tests_changeable_string_JOBS_formatted.py"
+    write_changeable_string(fname)
+    with open(fname_formatted, "wb") as file:
+        file.write(b'a = "A"\r\n')
+
+    for backend in ["process", "thread"]:
+        args = ["--check-hard", "--jobs=2", f"--jobs-backend={backend}", f"--files={fname}", fname_formatted]
+        with pytest.raises(SystemExit) as pytest_wrapped_e:
+            res = _main(args=args, standard_out=standard_out, standard_error=standard_error)
+        errcode = f"Error: --check-hard: need changes in file: {fname}"
+        assert pytest_wrapped_e.value.code == errcode
+    remove_file(fname)
+    remove_file(fname_formatted)
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_print_stats(standard_out: Any, standard_error: Any, capsys: Any) -> None:
+    fname = "tests/good/tests_001_raw.py"
+
+    args = ["--no-cache", "--check-soft", "--diff", "--print-stats", f"--files={fname}"]
+    res = _main(args=args, standard_out=standard_out, standard_error=standard_error)
+    captured = capsys.readouterr()
+    assert "    format_file.format_passes: 1\n" in captured.out
+    assert "    format_file.format_passes_saved: 1\n" in captured.out
+    assert "    nsq.memo.hit_rate: " in captured.out
@@ -0,0 +1,81 @@
+import os
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes import _main
+from autopep8_quotes._util import _cache
+from autopep8_quotes.args import agrs_parse
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_cache_enabled(tmp_path: Any) -> None:
+    args = agrs_parse([f"--cache-dir={tmp_path}"])
+    assert _cache.is_cache_enabled(args)
+    assert args._cache_dir == str(tmp_path)
+
+    args = agrs_parse([f"--cache-dir={tmp_path}", "--no-cache"])
+    assert not _cache.is_cache_enabled(args)
+    assert _cache.get_cache_key(args, b"") is None
+
+    args = agrs_parse([f"--cache-dir={tmp_path}", "--save-values-to-file"])
+    assert not _cache.is_cache_enabled(args)
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_config_hash(tmp_path: Any) -> None:
+    hash_1 = _cache.get_config_hash(agrs_parse([f"--cache-dir={tmp_path}"]))
+    hash_2 = _cache.get_config_hash(agrs_parse([f"--cache-dir={tmp_path}"]))
+    hash_3 = _cache.get_config_hash(agrs_parse([f"--cache-dir={tmp_path}", "--inline-quotes='"]))
+    hash_4 = _cache.get_config_hash(agrs_parse([f"--cache-dir={tmp_path}", "--plugin-order-ontoken-first=[]"]))
+    assert hash_1 == hash_2
+    assert hash_1 != hash_3
+    assert hash_1 != hash_4
+
+
+@pytest.mark.basic  # type: ignore
+def test_check_save_evict(tmp_path: Any) -> None:
+    args = agrs_parse([f"--cache-dir={tmp_path}", "--cache-max-entries=2"])
+
+    keys = [_cache.get_cache_key(args, f"a = {i}\n".encode()) for i in range(5)]
+    for key in keys:
+        assert not _cache.check(args, key)
+        assert _cache.save(args, key)
+        assert _cache.check(args, key)
+
+    # Entries were used in order, so first entries are removed
+    for i, key in enumerate(keys):
+        fname = _cache._get_entry_path(args, str(key))
+        os.utime(fname, (i, i))
+    assert _cache.evict(args) == 3
+    assert [_cache.check(args, key) for key in keys] == [False, False, False, True, True]
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_cache(tmp_path: Any) -> None:
+    fname = str(tmp_path / "formatted.py")
+    with open(fname, "wb") as f:
+        f.write(b'a = "A"\r\n')
+
+    args = [f"--cache-dir={tmp_path / 'cache'}", "--check-soft", "--check-soft-count", f"--files={fname}"]
+    assert _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr") == 0
+    assert len(os.listdir(tmp_path / "cache")) == 1
+    assert _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr") == 0
+
+    # Changed file is checked again
+    with open(fname, "wb") as f:
+        f.write(b"a = 'A'\r\n")
+    assert _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr") == 1
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_cache__warnings(tmp_path: Any, capsys: Any) -> None:
+    fname = str(tmp_path / "warning.py")
+    with open(fname, "wb") as f:
+        f.write(b"x = '\\N{bad name}'\r\n")
+
+    args = [f"--cache-dir={tmp_path / 'cache'}", "--check-soft", "--check-soft-count", f"--files={fname}"]
+    for _ in range(2):
+        assert _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr") == 0
+        assert "Can't check original!" in capsys.readouterr().out
+    assert not os.path.exists(tmp_path / "cache") or os.listdir(tmp_path / "cache") == []
@@ -0,0 +1,53 @@
+import threading
+from types import SimpleNamespace
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes.api import Formatter
+
+
+@pytest.mark.basic  # type: ignore
+def test_file_context() -> None:
+    args = SimpleNamespace(inline_quotes='"', _diff_files_count=5)
+    context = file_context(args, _read_filename="a.py")
+
+    # Not set attributes are read from args of run
+    assert context.inline_quotes == '"'
+    assert context._read_filename == "a.py"
+    assert isinstance(context, SimpleNamespace)
+
+    # Changes are kept in context
+    context._diff_files_count += 1
+    context._modified_tokens = []
+    assert context._diff_files_count == 6
+    assert args._diff_files_count == 5
+    assert not hasattr(args, "_modified_tokens")
+    assert not hasattr(args, "_read_filename")
+
+    with pytest.raises(AttributeError):
+        context.not_exist_attribute
+
+    # Context of context
+    inner = file_context(context)
+    assert inner._read_filename == "a.py"
+    assert inner.inline_quotes == '"'
+
+
+@pytest.mark.basic  # type: ignore
+def test_formatter__threads() -> None:
+    formatter = Formatter()
+    sources = [f"x_{i} = '{i}'\r\ny_{i} = u'{i}'\r\n" for i in range(200)]
+    expect = [formatter.format_source(source).formatted for source in sources]
+    results: List[List[str]] = [[] for _ in range(4)]
+
+    def run(index: int) -> None:
+        results[index] = [formatter.format_source(source).formatted for source in sources]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(results))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == expect for result in results)
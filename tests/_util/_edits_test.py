@@ -0,0 +1,78 @@
+import pytest  # type: ignore
+
+from autopep8_quotes._util._edits import apply_edits
+from autopep8_quotes._util._edits import get_lines_offsets
+from autopep8_quotes._util._edits import get_token_edit
+from autopep8_quotes._util._main import get_tokens
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_lines_offsets() -> None:
+    assert get_lines_offsets("a\r\nbc\rd\n\ne") == [0, 0, 3, 8, 9]
+    assert get_lines_offsets("") == [0, 0]
+
+
+@pytest.mark.basic  # type: ignore
+def test_apply_edits() -> None:
+    source = "a = 'a'\r\nb = '''b\r\n'''\r\n"
+    assert apply_edits(source, []) is source
+    # No-op edit
+    assert apply_edits(source, [((1, 4), (1, 7), "'a'")]) is source
+
+    edits = []
+    edits.append(((2, 4), (3, 3), '"""b\r\n"""'))
+    edits.append(((1, 4), (1, 7), '"a"'))
+    assert apply_edits(source, edits) == 'a = "a"\r\nb = """b\r\n"""\r\n'
+
+    # Overlapped edits: first by start is used
+    edits = []
+    edits.append(((2, 4), (2, 5), "c"))
+    edits.append(((1, 7), (4, 0), "\r\n"))
+    assert apply_edits(source, edits) == "a = 'a'\r\n"
+
+    # Edits of same span: later is used
+    edits = []
+    edits.append(((1, 4), (1, 7), '"a"'))
+    edits.append(((1, 4), (1, 7), "'a'"))
+    assert apply_edits(source, edits) is source
+    edits.append(((1, 4), (1, 7), '"x"'))
+    assert apply_edits(source, edits) == 'a = "x"\r\nb = \'\'\'b\r\n\'\'\'\r\n'
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_token_edit() -> None:
+    token = get_tokens("a = 'a'\n")[2]
+    assert get_token_edit(token, token) is None
+    assert get_token_edit(token, token._replace(string='"a"')) == ((1, 4), (1, 7), '"a"')
+    assert get_token_edit(token, token._replace(start=(1, 0), end=(1, 1))) == ((1, 0), (1, 7), "'a'")
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("fname", ["tests/good/tests_001_raw.py", "tests/good/tests_002_raw.py", "tests/good/test.py"])  # type: ignore
+def test_source_engine(fname: str) -> None:
+    from autopep8_quotes._util._main import format_code
+    from autopep8_quotes.args import agrs_parse
+
+    with open(fname, encoding="utf-8", newline="") as f:
+        source = f.read()
+    result = {}
+    for engine in ["splice", "untokenize"]:
+        args = agrs_parse([f"--source-engine={engine}", "--remove-empty-lines-spaces", "--print-disable", "--no-cache"])
+        args._read_filename = fname
+        result[engine] = format_code(source + "\n   \n\n", args=args, filename=fname)
+    assert result["splice"] == result["untokenize"]
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("source, expected", [("x = 1\n  ", "x = 1\r\n"),
+                                              ("  \n", "\r\n"),
+                                              ("x = 1\n\n  \n \t", "x = 1\r\n"),
+                                              ])  # type: ignore
+def test_source_engine__end_of_file(source: str, expected: str) -> None:
+    from autopep8_quotes._util._main import format_code
+    from autopep8_quotes.args import agrs_parse
+
+    for engine in ["splice", "untokenize"]:
+        args = agrs_parse([f"--source-engine={engine}", "--remove-empty-lines-spaces", "--print-disable", "--no-cache"])
+        args._read_filename = "test.py"
+        assert format_code(source, args=args, filename="test.py") == expected
@@ -0,0 +1,94 @@
+import io
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes import _main
+from autopep8_quotes._util._file_stats import file_stats_add
+from autopep8_quotes._util._file_stats import file_stats_count
+from autopep8_quotes._util._file_stats import file_stats_set
+from autopep8_quotes._util._file_stats import new_file_stats
+from autopep8_quotes._util._file_stats import write_file_stats
+
+
+@pytest.mark.basic  # type: ignore
+def test_file_stats() -> None:
+    args = SimpleNamespace(stats_json="stats.jsonl")
+    args._file_stats = new_file_stats(args, "a.py")
+    file_stats_set(args, "bytes", 10)
+    file_stats_add(args, "changed_literals", 2)
+    file_stats_count(args, "quotes_codes", "original__equal")
+    file_stats_count(args, "quotes_codes", "original__equal")
+
+    stream = io.StringIO()
+    write_file_stats(stream, args._file_stats, {"stage.read": [1, 0.5], "ontoken.x": [3, 1.0]})
+    record = json.loads(stream.getvalue())
+    assert record["path"] == "a.py"
+    assert record["bytes"] == 10
+    assert record["changed_literals"] == 2
+    assert record["quotes_codes"] == {"original__equal": 2}
+    # Only stages are written
+    assert record["stages"] == {"read": 0.5}
+    assert record["error"] is None
+
+    # Disabled: nothing is collected and written
+    args = SimpleNamespace(stats_json="")
+    args._file_stats = new_file_stats(args, "a.py")
+    file_stats_set(args, "bytes", 10)
+    file_stats_count(args, "quotes_codes", "original__equal")
+    assert args._file_stats is None
+    write_file_stats(stream, None, None)
+    assert len(stream.getvalue().splitlines()) == 1
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("jobs", ["1", "2"])  # type: ignore
+def test__main_stats_json(tmp_path: Any, jobs: str) -> None:
+    fname = tmp_path / "a.py"
+    fname.write_text("a = 'x'\nb = \"y\"\nc = 'it\\'s'\n", encoding="utf-8")
+    stats_json = tmp_path / "stats.jsonl"
+    args = ["--check-soft", "--no-cache", "--no-prefilter", f"--stats-json={stats_json}", f"--jobs={jobs}",
+            f"--files={fname}"]
+    _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr")
+
+    records = {x["path"]: x for x in map(json.loads, stats_json.read_text(encoding="utf-8").splitlines())}
+    assert set(records) == {str(fname)}
+    record = records[str(fname)]
+    assert record["bytes"] == len(fname.read_bytes())
+    assert record["string_tokens"] == 3
+    assert record["tokens"] > record["string_tokens"]
+    assert record["changed_literals"] == 2
+    assert record["quotes_codes"] == {"changed__new_quote": 2, "original__prefer_double_quotes": 1}
+    assert record["cache"] is None
+    assert {"read", "tokenize", "transform"} <= set(record["stages"])
+    assert record["error"] is None
+
+
+@pytest.mark.basic  # type: ignore
+def test__main_stats_json_cache(tmp_path: Any) -> None:
+    fname = tmp_path / "a.py"
+    fname.write_bytes(b'a = "x"\r\n')
+    stats_json = tmp_path / "stats.jsonl"
+    args = ["--check-soft", f"--cache-dir={tmp_path / 'cache'}", f"--stats-json={stats_json}", f"--files={fname}"]
+    for cache in ["miss", "hit"]:
+        _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr")
+        record = json.loads(stats_json.read_text(encoding="utf-8"))
+        assert record["cache"] == cache
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("engine", ["fused", "multipass"])  # type: ignore
+def test_changed_literals__engine(engine: str) -> None:
+    from autopep8_quotes._util._context import file_context
+    from autopep8_quotes._util._main import format_code
+    from autopep8_quotes.args import agrs_parse
+
+    args = agrs_parse(["--print-disable", "--no-cache", "--no-prefilter", f"--token-engine={engine}", "--stats-json=stats.jsonl"],
+                      _standard_out="sys.stdout")
+    context = file_context(args, _read_filename="a.py", _file_stats=new_file_stats(args, "a.py"))
+    # Literal changed by two plugins (u prefix and quotes) is counted once
+    result = format_code("a = u'x'\r\nb = \"y\"\r\n", args=context, filename="a.py")
+    assert result == 'a = "x"\r\nb = "y"\r\n'
+    assert context._file_stats["changed_literals"] == 1
@@ -0,0 +1,122 @@
+import os
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._files import get_files_pattern
+from autopep8_quotes._util._files import iter_files
+
+
+def make_tree(root: str, files: List[str]) -> None:
+    for fname in files:
+        fname = os.path.join(root, fname)
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        with open(fname, "w"):
+            pass
+
+
+def get_args(files: List[str], recursive: bool = True, patterns: List[str] = [r".*\.py$"]) -> SimpleNamespace:
+    args = SimpleNamespace()
+    args.files = files
+    args.recursive = recursive
+    args.read_files_matching_pattern = patterns
+    return args
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_files_pattern() -> None:
+    pattern = get_files_pattern([r".*\.py$", r".*\.pyi$"])
+    assert pattern.match("a/b.py")
+    assert pattern.match("a/b.pyi")
+    assert not pattern.match("a/b.txt")
+
+
+@pytest.mark.basic  # type: ignore
+def test_iter_files(tmp_path: Any) -> None:
+    root = str(tmp_path)
+    make_tree(root, ["a.py", "b.txt", "c/d.py", "c/e/f.py", ".hidden/g.py", "c/.h.py"])
+    os.symlink(os.path.join(root, "a.py"), os.path.join(root, "c", "link.py"))
+
+    result = list(iter_files(get_args([root])))
+    expect = ["a.py", "c/d.py", "c/e/f.py", "c/.h.py"]
+    assert sorted(result) == sorted(os.path.join(root, x) for x in expect)
+    # Directory is scanned before its subdirectories
+    assert result[0] == os.path.join(root, "a.py")
+
+    result = list(iter_files(get_args([root], recursive=False)))
+    assert result == [os.path.join(root, "a.py")]
+
+    # Same file is yielded once
+    fname = os.path.join(root, "c", "d.py")
+    result = list(iter_files(get_args([fname, os.path.join(root, "c", "..", "c", "d.py"), os.path.join(root, "c")], recursive=False)))
+    assert result[0] == fname
+    assert sorted(result[1:]) == sorted([os.path.join(root, "c", ".h.py"), os.path.join(root, "c", "link.py")])
+
+    # Files are yielded as is, without check of pattern
+    result = list(iter_files(get_args([os.path.join(root, "b.txt")])))
+    assert result == [os.path.join(root, "b.txt")]
+
+
+@pytest.mark.basic  # type: ignore
+def test_iter_files__not_exist(tmp_path: Any) -> None:
+    with pytest.raises(IOError):
+        list(iter_files(get_args([os.path.join(str(tmp_path), "not_exist.py")])))
+
+
+@pytest.mark.basic  # type: ignore
+def test_iter_files__unreadable_dir(tmp_path: Any, monkeypatch: Any) -> None:
+    root = str(tmp_path)
+    make_tree(root, ["a.py", "bad/b.py", "bad/c/d.py", "good/e.py"])
+    scandir = os.scandir
+
+    def fake_scandir(path: str) -> Any:
+        if os.path.basename(path) == "bad":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", fake_scandir)
+    # Unreadable directory is skipped, other files are found
+    result = list(iter_files(get_args([root])))
+    assert sorted(result) == sorted(os.path.join(root, x) for x in ["a.py", "good/e.py"])
+
+
+@pytest.mark.basic  # type: ignore
+def test_iter_files__exclude(tmp_path: Any) -> None:
+    root = str(tmp_path)
+    make_tree(root, ["a.py", "b.py", "venv/c.py", "pkg/build/d.py", "pkg/e.py", "pkg/gen/f.py", "g.egg/h.py"])
+
+    args = get_args([root])
+    args.exclude = ".git,__pycache__,*.egg"
+    args.extend_exclude = "venv, build,b.py," + os.path.join(root, "pkg", "gen")
+    result = list(iter_files(args))
+    assert sorted(result) == sorted(os.path.join(root, x) for x in ["a.py", "pkg/e.py"])
+
+    # Excluded files and directories from args.files are skipped too
+    args.files = [os.path.join(root, "venv"), os.path.join(root, "b.py"), os.path.join(root, "a.py")]
+    assert list(iter_files(args)) == [os.path.join(root, "a.py")]
+
+
+@pytest.mark.basic  # type: ignore
+def test_iter_files__gitignore(tmp_path: Any) -> None:
+    root = str(tmp_path)
+    make_tree(root, [".git/config", "a.py", "b_pb2.py", "keep_pb2.py", "build/c.py", "pkg/d.py", "pkg/e.py", "pkg/sub/f.py", "pkg/sub/g.py"])
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("# generated\n*_pb2.py\n!keep_pb2.py\nbuild/\n/pkg/sub/g.py\n")
+    with open(os.path.join(root, "pkg", ".gitignore"), "w") as f:
+        f.write("d.py\n")
+
+    args = get_args([root])
+    result = list(iter_files(args))
+    assert len(result) == 8
+
+    args.gitignore = True
+    expect = ["a.py", "keep_pb2.py", "pkg/e.py", "pkg/sub/f.py"]
+    result = list(iter_files(args))
+    assert sorted(result) == sorted(os.path.join(root, x) for x in expect)
+
+    # Rules of parent directories are applied when subdirectory is scanned
+    args.files = [os.path.join(root, "pkg")]
+    result = list(iter_files(args))
+    assert sorted(result) == sorted(os.path.join(root, x) for x in ["pkg/e.py", "pkg/sub/f.py"])
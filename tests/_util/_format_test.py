@@ -38,3 +38,36 @@ def test__save_values_to_file() -> None:
     input_list = [token_dict1, token_dict2, token_dict3]
 
     util_format.save_values_to_file(args=args, input_list=input_list, name="test")
+
+
+@pytest.mark.basic  # type: ignore
+def test__get_token_dict() -> None:
+    from autopep8_quotes._util import _format as util_format
+    token_dict = util_format.get_token_dict(3, "'a'", (1, 4), (2, 1), "a = 'a'\n", "filename")
+    expect = {}
+    expect["token_type"] = 3
+    expect["token_string"] = "'a'"
+    expect["start"] = (1, 4)
+    expect["end"] = (2, 1)
+    expect["line"] = "a = 'a'\n"
+    expect["filename"] = "filename"
+    expect["text"] = "Line 1, pos 4 - line 2, pos 1: 'a'"
+    expect["pos"] = "Line:pos (1:4 - 2:1)"
+    expect["pos1"] = "(1:4 - 2:1)"
+    expect["pos2"] = "Line 1, pos 4 - line 2, pos 1"
+    assert dict(token_dict.items()) == expect
+    assert {key: token_dict[key] for key in token_dict} == expect
+    assert token_dict.get("pos1") == "(1:4 - 2:1)"
+    assert token_dict.get("unknown", 1) == 1
+    assert "pos" in token_dict
+    with pytest.raises(KeyError):
+        token_dict["unknown"]
+
+    token_dict["pos1"] = "pos1"
+    token_dict["token_string"] = "'b'"
+    token_dict["new_key"] = "new_value"
+    assert token_dict["pos1"] == "pos1"
+    assert token_dict.token_string == "'b'"
+    assert token_dict["new_key"] == "new_value"
+    assert "new_key" in token_dict.keys()
+    assert len(token_dict) == 11
@@ -0,0 +1,98 @@
+import os
+import subprocess  # nosec
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes import _main
+from autopep8_quotes._util._files import iter_files
+from autopep8_quotes._util._git_diff import get_changed_files
+from autopep8_quotes._util._git_diff import is_git_diff_enabled
+
+
+def git(root: str, *git_args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com"] + list(git_args),
+                   cwd=root, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)  # nosec
+
+
+def write(root: str, fname: str, text: str = "x = 1\n") -> None:
+    fname = os.path.join(root, fname)
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    with open(fname, "w") as f:
+        f.write(text)
+
+
+def make_repo(root: str) -> None:
+    git(root, "init", "-q")
+    for fname in ["a.py", "b.py", "c.txt", "pkg/d.py", "pkg/e.py", "venv/f.py", "removed.py"]:
+        write(root, fname)
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "init")
+    git(root, "tag", "base")
+
+
+def get_args(**kwargs: Any) -> Any:
+    from types import SimpleNamespace
+
+    args = SimpleNamespace(files=None, recursive=True, read_files_matching_pattern=[r".*\.py$"],
+                           exclude="venv", since="", staged=False)
+    args.__dict__.update(kwargs)
+    return args
+
+
+def relative(root: str, files: List[str]) -> List[str]:
+    return sorted(os.path.relpath(x, root).replace(os.sep, "/") for x in files)
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_git_diff_enabled() -> None:
+    assert not is_git_diff_enabled(get_args())
+    assert is_git_diff_enabled(get_args(since="HEAD"))
+    assert is_git_diff_enabled(get_args(staged=True))
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_changed_files(tmp_path: Any, monkeypatch: Any) -> None:
+    root = os.path.realpath(str(tmp_path))
+    make_repo(root)
+    monkeypatch.chdir(root)
+
+    write(root, "a.py", "x = 2\n")
+    write(root, "c.txt", "x = 2\n")
+    write(root, "pkg/d.py", "x = 2\n")
+    write(root, "venv/f.py", "x = 2\n")
+    os.remove(os.path.join(root, "removed.py"))
+    git(root, "add", "pkg/d.py")
+    git(root, "rm", "-q", "--cached", "removed.py")
+
+    assert relative(root, get_changed_files(None, since="base")) == ["a.py", "c.txt", "pkg/d.py", "venv/f.py"]
+    assert relative(root, get_changed_files(None, staged=True)) == ["pkg/d.py"]
+    assert relative(root, get_changed_files(["pkg"], since="base")) == ["pkg/d.py"]
+
+    # Files are filtered by read_files_matching_pattern and --exclude
+    assert relative(root, iter_files(get_args(since="base"))) == ["a.py", "pkg/d.py"]
+    assert relative(root, iter_files(get_args(staged=True))) == ["pkg/d.py"]
+    assert relative(root, iter_files(get_args(since="base", files=["pkg"]))) == ["pkg/d.py"]
+
+    # Only files of current directory by default
+    monkeypatch.chdir(os.path.join(root, "pkg"))
+    assert relative(root, iter_files(get_args(since="base"))) == ["pkg/d.py"]
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_changed_files__bad_rev(tmp_path: Any, monkeypatch: Any) -> None:
+    root = str(tmp_path)
+    make_repo(root)
+    monkeypatch.chdir(root)
+    with pytest.raises(IOError):
+        get_changed_files(None, since="not_exist_rev")
+
+
+@pytest.mark.basic  # type: ignore
+def test__main__bad_rev(tmp_path: Any, monkeypatch: Any, capsys: Any) -> None:
+    root = str(tmp_path)
+    make_repo(root)
+    monkeypatch.chdir(root)
+    assert _main(args=["--since=not_exist_rev"], standard_out="sys.stdout", standard_error="sys.stderr") == 1
+    assert "not_exist_rev" in capsys.readouterr().err
@@ -0,0 +1,97 @@
+import io
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._git_filter import format_blob
+from autopep8_quotes._util._git_filter import read_pkt_content
+from autopep8_quotes._util._git_filter import read_pkt_line
+from autopep8_quotes._util._git_filter import read_pkt_text_list
+from autopep8_quotes._util._git_filter import run_filter_process
+from autopep8_quotes._util._git_filter import write_pkt_content
+from autopep8_quotes._util._git_filter import write_pkt_flush
+from autopep8_quotes._util._git_filter import write_pkt_text_list
+from autopep8_quotes.args import agrs_parse
+
+
+def git_request(stream: Any, command: str, pathname: str, content: bytes) -> None:
+    write_pkt_text_list(stream, [f"command={command}", f"pathname={pathname}"])
+    write_pkt_content(stream, content)
+
+
+def run_git(requests: List[Any], capabilities: List[str]) -> Any:
+    """Stand-in for git: write all requests, run filter, return output stream at start"""
+    stdin = io.BytesIO()
+    write_pkt_text_list(stdin, ["git-filter-client", "version=2"])
+    write_pkt_text_list(stdin, [f"capability={x}" for x in capabilities])
+    for command, pathname, content in requests:
+        git_request(stdin, command, pathname, content)
+    stdin.seek(0)
+
+    stdout = io.BytesIO()
+    args = agrs_parse(["--git-filter-process"])
+    assert run_filter_process(args, stdin, stdout) == 0
+    stdout.seek(0)
+    return stdout
+
+
+@pytest.mark.basic  # type: ignore
+def test_pkt_line() -> None:
+    stream = io.BytesIO()
+    write_pkt_text_list(stream, ["a=1", "b"])
+    write_pkt_content(stream, b"x" * 70000)
+    write_pkt_flush(stream)
+    assert stream.getvalue().startswith(b"0008a=1\n0006b\n0000fff0")
+
+    stream.seek(0)
+    assert read_pkt_text_list(stream) == ["a=1", "b"]
+    assert read_pkt_content(stream) == b"x" * 70000
+    assert read_pkt_line(stream) is None
+    with pytest.raises(EOFError):
+        read_pkt_line(stream)
+
+
+@pytest.mark.basic  # type: ignore
+def test_run_filter_process() -> None:
+    requests = []
+    requests.append(("clean", "a.py", b"a = 'a'\r\n"))
+    requests.append(("smudge", "dir/b.py", b'b = "b"\r\n'))
+    requests.append(("clean", "c.py", b"c = 'c'\r\n" * 10000))
+    stdout = run_git(requests, capabilities=["clean", "smudge", "delay"])
+
+    assert read_pkt_text_list(stdout) == ["git-filter-server", "version=2"]
+    assert read_pkt_text_list(stdout) == ["capability=clean", "capability=smudge"]
+    for expect in [b'a = "a"\r\n', b'b = "b"\r\n', b'c = "c"\r\n' * 10000]:
+        assert read_pkt_text_list(stdout) == ["status=success"]
+        assert read_pkt_content(stdout) == expect
+        assert read_pkt_text_list(stdout) == []
+    assert stdout.read() == b""
+
+
+@pytest.mark.basic  # type: ignore
+def test_run_filter_process__not_supported_command() -> None:
+    stdout = run_git([("smudge", "a.py", b"a = 'a'\r\n")], capabilities=["clean"])
+
+    assert read_pkt_text_list(stdout) == ["git-filter-server", "version=2"]
+    assert read_pkt_text_list(stdout) == ["capability=clean"]
+    assert read_pkt_text_list(stdout) == ["status=error"]
+    assert stdout.read() == b""
+
+
+@pytest.mark.basic  # type: ignore
+def test_run_filter_process__bad_client() -> None:
+    stdin = io.BytesIO()
+    write_pkt_text_list(stdin, ["git-filter-client", "version=3"])
+    stdin.seek(0)
+    args = agrs_parse(["--git-filter-process"])
+    assert run_filter_process(args, stdin, io.BytesIO()) == 1
+
+
+@pytest.mark.basic  # type: ignore
+def test_format_blob__encoding() -> None:
+    args = agrs_parse(["--git-filter-process"])
+    content = "# -*- coding: latin-1 -*-\r\na = '\xe9'\r\n".encode("latin-1")
+    assert format_blob(args, "a.py", content) == content.replace(b"'", b'"')
+    content = b'\xef\xbb\xbfa = "a"\r\n'
+    assert format_blob(args, "a.py", content) is content
@@ -0,0 +1,61 @@
+import os
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._gitignore import is_ignored
+from autopep8_quotes._util._gitignore import parse_gitignore
+from autopep8_quotes._util._gitignore import translate_pattern
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("pattern, path, expect", [
+    ("*.py", "a.py", True),
+    ("*.py", "a/b/c.py", True),
+    ("*.py", "a.pyc", False),
+    ("a/*.py", "a/b.py", True),
+    ("a/*.py", "a/b/c.py", False),
+    ("a/*.py", "b/a/c.py", False),
+    ("/a.py", "a.py", True),
+    ("/a.py", "b/a.py", False),
+    ("**/gen", "a/b/gen", True),
+    ("**/gen", "gen", True),
+    ("a/**/b", "a/b", True),
+    ("a/**/b", "a/x/y/b", True),
+    ("a/**", "a/x/y", True),
+    ("file_?.py", "file_1.py", True),
+    ("file_?.py", "file_10.py", False),
+    ("file_[0-9].py", "file_1.py", True),
+    ("file_[!0-9].py", "file_1.py", False),
+    ("file_[!0-9].py", "file_a.py", True),
+    ("\\*.py", "*.py", True),
+    ("\\*.py", "a.py", False),
+])
+def test_translate_pattern(pattern: str, path: str, expect: bool) -> None:
+    import re
+
+    assert bool(re.fullmatch(translate_pattern(pattern), path)) == expect
+
+
+@pytest.mark.basic  # type: ignore
+def test_parse_gitignore() -> None:
+    rules = parse_gitignore(["# comment\n", "\n", "build/\n", "*.log  \n", "!keep.log\n", "\\#hash\n", "\\!bang\n"])
+    assert [(rule.negate, rule.dir_only) for rule in rules] == [(False, True), (False, False), (True, False), (False, False), (False, False)]
+    assert rules[3].regex.fullmatch("#hash")
+    assert rules[4].regex.fullmatch("!bang")
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_ignored(tmp_path: Any) -> None:
+    root = str(tmp_path)
+    sub = os.path.join(root, "sub")
+    levels: Any = ((root, parse_gitignore(["*.log", "!keep.log", "build/"])), (sub, parse_gitignore(["!sub.log"])))
+
+    assert is_ignored(levels, os.path.join(root, "a.log"), False)
+    assert not is_ignored(levels, os.path.join(root, "keep.log"), False)
+    assert is_ignored(levels, os.path.join(root, "build"), True)
+    # Only directories are matched by pattern with trailing "/"
+    assert not is_ignored(levels, os.path.join(root, "build"), False)
+    # Deeper .gitignore overrides parent one
+    assert is_ignored(levels, os.path.join(sub, "a.log"), False)
+    assert not is_ignored(levels, os.path.join(sub, "sub.log"), False)
@@ -10,6 +10,8 @@ import pytest  # type: ignore
 
 from autopep8_quotes._util._io import detect_encoding
 from autopep8_quotes._util._io import load_modules
+from autopep8_quotes._util._io import load_modules_ep
+from autopep8_quotes._util._io import load_source
 from autopep8_quotes._util._io import open_with_encoding
 from autopep8_quotes._util._io import stdout_get
 from autopep8_quotes._util._io import stdout_print
@@ -68,6 +70,27 @@ def test_detect_encoding(filename: str, mode: str) -> None:
         a = detect_encoding(filename=filename)
 
 
+testdata_load_source = []
+testdata_load_source.append((b"a = 1\r\n", "utf-8", "a = 1\r\n"))
+testdata_load_source.append((b"\xef\xbb\xbfa = '\xd0\xb0'\n", "utf-8-sig", "a = '\u0430'\n"))
+testdata_load_source.append((b"# -*- coding: latin-1 -*-\na = '\xe9'\n", "iso-8859-1", "# -*- coding: latin-1 -*-\na = '\xe9'\n"))
+testdata_load_source.append((b"# -*- coding: unknown -*-\n", "latin-1", "# -*- coding: unknown -*-\n"))
+testdata_load_source.append((b"a = '\xe9'\n", "latin-1", "a = '\xe9'\n"))
+
+
+@pytest.mark.basic
+@pytest.mark.parametrize("raw,expect_encoding,text", testdata_load_source)
+def test_load_source(tmp_path: Any, raw: bytes, expect_encoding: str, text: str) -> None:
+    fname = os.path.join(tmp_path, "source.py")
+    with open(fname, "wb") as f:
+        f.write(raw)
+    loaded = load_source(fname)
+    assert loaded.raw == raw
+    assert loaded.encoding == expect_encoding
+    assert loaded.text == text
+    assert detect_encoding(fname) == expect_encoding
+
+
 @pytest.mark.basic
 def test_load_modules(search_path: str, pat: Union[str, Pattern[Any]]) -> None:
     # Load all modules from location
@@ -76,6 +99,14 @@ def test_load_modules(search_path: str, pat: Union[str, Pattern[Any]]) -> None:
     assert len(_modules_dict) != 0
 
 
+@pytest.mark.basic
+def test_load_modules_ep() -> None:
+    _modules_dict = load_modules_ep("autopep8_quotes.formatter")
+    name = "autopep8_quotes.modules.formater.normalize_string_quotes:normalize_string_quotes"
+    assert name in _modules_dict
+    assert _modules_dict[name].apply.is_parse
+
+
 @pytest.mark.basic
 def test_stdout_print(value: Any, otype: str) -> None:
     args = SimpleNamespace()
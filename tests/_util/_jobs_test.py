@@ -0,0 +1,72 @@
+import os
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util import _jobs
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("value,expect", [("1", 1), (4, 4), ("-3", 1), ("bad", 1), (None, 1),
+                                          ("auto", os.cpu_count() or 1), ("0", os.cpu_count() or 1)])  # type: ignore
+def test_get_jobs_count(value: Any, expect: int) -> None:
+    assert _jobs.get_jobs_count(value) == expect
+
+
+@pytest.mark.basic  # type: ignore
+def test_jobs_type(capsys: Any) -> None:
+    from autopep8_quotes.args import agrs_parse
+
+    assert agrs_parse(["--jobs", "3"]).jobs == "3"
+    assert agrs_parse(["--jobs", "AUTO"]).jobs == "auto"
+    for value in ["abc", "-3", "0"]:
+        with pytest.raises(SystemExit) as e:
+            agrs_parse(["--jobs", value])
+        assert e.value.code == 2
+        assert "argument -j/--jobs: expected positive number or 'auto'" in capsys.readouterr().err
+
+
+@pytest.mark.basic  # type: ignore
+def test_worker_format_file() -> None:
+    import datetime
+
+    _jobs._worker_init(["--diff", "--diff-count"], {"_standard_out": "sys.stdout", "_standard_error": "sys.stderr"}, datetime.datetime.now())
+
+    result = _jobs._worker_format_file("tests/good/tests_001_raw.py")
+    assert result.name == "tests/good/tests_001_raw.py"
+    assert result.changed
+    assert result.error is None
+    assert result.exit_code is None
+    assert result.diff_files_count == 1
+    assert "+++ after /tests/good/tests_001_raw.py" in result.output
+
+    result = _jobs._worker_format_file("tests/good/not_exist_file.py")
+    assert result.error is not None
+
+
+@pytest.mark.basic  # type: ignore
+def test_format_files_parallel__thread() -> None:
+    from autopep8_quotes.args import agrs_parse
+
+    args = agrs_parse(["--diff", "--diff-count", "--no-cache"], _standard_out="sys.stdout", _standard_error="sys.stderr")
+    files = ["tests/good/tests_001_raw.py", "tests/good/tests_001_good.py", "tests/good/not_exist_file.py", "tests/good/tests_002_raw.py"]
+    results = list(_jobs.format_files_parallel(args, files, jobs=3, argv=[], kwargs={}, backend="thread"))
+
+    # Results are in order of files, output of each file is captured
+    assert [result.name for result in results] == files
+    assert [result.changed for result in results] == [True, False, False, True]
+    assert results[2].error is not None
+    assert "+++ after /tests/good/tests_001_raw.py" in results[0].output
+    assert "tests_002_raw.py" not in results[0].output
+    # Args of run are not changed by files
+    assert not hasattr(args, "_read_filename")
+    assert args._stats == {}
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_parallel_allowed() -> None:
+    from autopep8_quotes.args import agrs_parse
+
+    assert _jobs.is_parallel_allowed(agrs_parse(["--diff"], _standard_out="sys.stdout", _standard_error="sys.stderr"))
+    # Diffs of all files are written into one log in order of files
+    assert not _jobs.is_parallel_allowed(agrs_parse(["--diff-to-txt"], _standard_out="sys.stdout", _standard_error="sys.stderr"))
@@ -0,0 +1,113 @@
+import os
+import subprocess  # nosec
+from types import SimpleNamespace
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._line_ranges import get_file_line_ranges
+from autopep8_quotes._util._line_ranges import get_staged_hunks
+from autopep8_quotes._util._line_ranges import intersect_line_ranges
+from autopep8_quotes._util._line_ranges import is_in_line_ranges
+from autopep8_quotes._util._line_ranges import merge_line_ranges
+from autopep8_quotes._util._line_ranges import parse_line_range
+from autopep8_quotes._util._line_ranges import parse_line_ranges
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes.args import agrs_parse
+
+
+def git(root: str, *git_args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com"] + list(git_args),
+                   cwd=root, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)  # nosec
+
+
+def write(root: str, fname: str, text: str) -> None:
+    with open(os.path.join(root, fname), "w") as f:
+        f.write(text)
+
+
+@pytest.mark.basic  # type: ignore
+def test_parse_line_range() -> None:
+    assert parse_line_range("1-5") == (1, 5)
+    assert parse_line_range(" 3 ") == (3, 3)
+    assert parse_line_range((2, 4)) == (2, 4)
+    for value in ["0-5", "5-1", "a-b", "1-2-3"]:
+        with pytest.raises(ValueError):
+            parse_line_range(value)
+
+
+@pytest.mark.basic  # type: ignore
+def test_parse_line_ranges(capsys: Any) -> None:
+    assert parse_line_ranges(None) is None
+    assert parse_line_ranges(["5-6", "1-2"]) == [(1, 2), (5, 6)]
+    # Value from config file
+    assert parse_line_ranges("1-2, 3") == [(1, 3)]
+
+    assert agrs_parse(["--line-ranges", "3", "1-2"])._line_ranges_option == [(1, 3)]
+    for value in ["abc", "0-5"]:
+        with pytest.raises(SystemExit) as e:
+            agrs_parse(["--line-ranges", value])
+        assert e.value.code == 2
+        assert f"argument --line-ranges: Bad line range: {value}" in capsys.readouterr().err
+
+
+@pytest.mark.basic  # type: ignore
+def test_merge_line_ranges() -> None:
+    assert merge_line_ranges([(10, 12), (1, 3), (4, 5), (11, 20), (30, 30)]) == [(1, 5), (10, 20), (30, 30)]
+    assert intersect_line_ranges([(1, 5), (10, 20)], [(4, 12)]) == [(4, 5), (10, 12)]
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_in_line_ranges() -> None:
+    ranges = [(3, 5), (10, 20)]
+    assert is_in_line_ranges(ranges, 3, 3)
+    assert is_in_line_ranges(ranges, 4, 5)
+    assert is_in_line_ranges(ranges, 10, 20)
+    assert not is_in_line_ranges(ranges, 1, 1)
+    assert not is_in_line_ranges(ranges, 5, 6)
+    assert not is_in_line_ranges(ranges, 7, 7)
+    assert not is_in_line_ranges(ranges, 21, 21)
+
+
+@pytest.mark.basic  # type: ignore
+def test_format_code__line_ranges() -> None:
+    args = agrs_parse(["--no-cache"], _standard_out="sys.stdout")
+    source = "x = 'a'\ny = 'b'\nz = '''c\nd'''\n"
+
+    args._line_ranges = [(2, 2)]
+    assert format_code(source, args=args, filename="test.py") == "x = 'a'\ny = \"b\"\nz = '''c\nd'''\n"
+
+    # Multiline string is changed only when all its lines are inside range
+    args._line_ranges = [(1, 3)]
+    assert format_code(source, args=args, filename="test.py") == "x = \"a\"\ny = \"b\"\nz = '''c\nd'''\n"
+
+    args._line_ranges = []
+    assert format_code(source, args=args, filename="test.py") == source
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_staged_hunks(tmp_path: Any, monkeypatch: Any) -> None:
+    root = str(tmp_path)
+    monkeypatch.chdir(root)
+    git(root, "init", "-q")
+    write(root, "a.py", "".join(f"x{i} = 1\n" for i in range(10)))
+    git(root, "add", "a.py")
+    git(root, "commit", "-q", "-m", "lines")
+
+    lines = [f"x{i} = 1\n" for i in range(10)]
+    lines[1] = "x1 = 2\n"
+    lines[5:7] = ["x5 = 2\n", "x6 = 2\n", "new = 1\n"]
+    del lines[9]
+    write(root, "a.py", "".join(lines))
+    git(root, "add", "a.py")
+    assert get_staged_hunks("a.py") == [(2, 2), (6, 8)]
+    assert get_staged_hunks("b.py") == []
+
+    args = SimpleNamespace(_line_ranges_option=[(1, 2), (8, 20)], staged_hunks=True)
+    assert get_file_line_ranges(args, "a.py") == [(2, 2), (8, 8)]
+    assert get_file_line_ranges(SimpleNamespace(), "a.py") is None
+
+    # Unstaged line above staged hunks: file is skipped
+    write(root, "a.py", "top = 1\n" + "".join(lines))
+    args = SimpleNamespace(staged_hunks=True, print_disable=True)
+    assert get_file_line_ranges(args, "a.py") == []
@@ -0,0 +1,81 @@
+import datetime
+import os
+from types import SimpleNamespace
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes import _main
+from autopep8_quotes._util._format import save_values_to_file
+from autopep8_quotes._util._log_sink import flush_logs
+from autopep8_quotes._util._log_sink import log_sink
+
+
+@pytest.mark.basic  # type: ignore
+def test_log_sink(tmp_path: Any) -> None:
+    sink = log_sink(batch_size=3, flush_interval=0.01)
+    a = str(tmp_path / "log" / "a.txt")
+    b = str(tmp_path / "log" / "b.txt")
+    for i in range(10):
+        sink.write(a, f"a{i}\n")
+        sink.write(b, f"b{i}\n")
+    sink.flush()
+    assert open(a).read() == "".join(f"a{i}\n" for i in range(10))
+    # One handle for each file
+    assert set(sink.handles) == {a, b}
+
+    sink.close()
+    assert sink.thread is None and not sink.handles
+    sink.close()
+
+    # New records after close are appended
+    sink.write(a, "next\n")
+    sink.close()
+    assert open(a).read().splitlines()[-2:] == ["a9", "next"]
+    assert open(b).read() == "".join(f"b{i}\n" for i in range(10))
+
+
+@pytest.mark.basic  # type: ignore
+def test_log_sink__error(tmp_path: Any, capsys: Any) -> None:
+    sink = log_sink(flush_interval=0.01)
+    a = str(tmp_path / "a.txt")
+
+    def fail(filename: str) -> Any:
+        raise RuntimeError("broken")
+
+    sink._get_handle = fail  # type: ignore
+    sink.write(a, "lost\n")
+    # Error is reported and thread still works
+    sink.flush()
+    assert "Can't write logs: broken" in capsys.readouterr().err
+    assert sink.thread is not None and sink.thread.is_alive()
+
+    del sink._get_handle
+    sink.write(a, "next\n")
+    sink.close()
+    assert open(a).read() == "next\n"
+
+
+@pytest.mark.basic  # type: ignore
+def test_save_values_to_file(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.chdir(tmp_path)
+    args = SimpleNamespace(_datetime_start=datetime.datetime(2020, 1, 2, 3, 4, 5), print_disable=True)
+    save_values_to_file(args=args, name="test", input_list=[{"filename": "a.py", "pos1": "(1:0 - 1:3)", "token_string": "'a'"}])
+    save_values_to_file(args=args, name="test", input_list={"filename": "b.py", "pos1": "(2:0 - 2:3)", "token_string": "'b'"})
+    flush_logs()
+    with open("log/autopep8_quotes.test.20200102 030405.txt", encoding="utf-8") as f:
+        assert f.read() == "\n# a.py:(1:0 - 1:3)\na_1 = 'a'\n\n# b.py:(2:0 - 2:3)\na_1 = 'b'\n"
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("jobs", ["1", "2"])  # type: ignore
+def test__main_save_values_to_file(tmp_path: Any, monkeypatch: Any, jobs: str) -> None:
+    monkeypatch.chdir(tmp_path)
+    for i in range(4):
+        (tmp_path / f"f{i}.py").write_text(f"a = 'x{i}'\nb = 'y{i}'\n", encoding="utf-8")
+    args = ["--print-disable", "--check-soft", "--save-values-to-file", "--no-cache", f"--jobs={jobs}", "--recursive", f"--files={tmp_path}"]
+    _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr")
+
+    # Logs are written when _main returns
+    text = "".join(open(os.path.join("log", name), encoding="utf-8").read() for name in os.listdir("log"))
+    assert all(f"'x{i}'" in text and f"'y{i}'" in text for i in range(4))
@@ -38,3 +38,114 @@ def test_format_code__tokenizer_error():
     with open_with_encoding(filename=filename, encoding=encoding, mode=mode) as f:
         source = f.read()
     assert source == _main.format_code(source=source, args=args, filename=filename)
+
+
+def test_format_file__format_once(tmp_path):
+    from autopep8_quotes.args import agrs_parse
+
+    fname = str(tmp_path / "changeable.py")
+    with open(fname, "wb") as f:
+        f.write(b"a = 'A'\r\n")
+
+    # All plugins use same result of formatting
+    args = agrs_parse(["--no-cache", "--check-soft", "--diff", "--diff-to-txt", "--new-file"], _standard_out="sys.stdout")
+    args._read_filename = fname
+    args._diff_files_count = 0
+    assert _main.format_file(args=args)
+    assert args._stats["format_file.format_passes"] == 1
+    assert args._stats["format_file.format_passes_saved"] == 3
+
+    # File is changed by --in-place, so it is formatted again for next plugin
+    args = agrs_parse(["--no-cache", "--check-soft", "--in-place", "--check-hard"], _standard_out="sys.stdout")
+    args._read_filename = fname
+    args._diff_files_count = 0
+    _main.format_file(args=args)
+    assert args._stats["format_file.format_passes"] == 2
+    assert args._stats["format_file.format_passes_saved"] == 1
+
+
+def test_get_plugins_passes():
+    from autopep8_quotes.args import agrs_parse
+
+    args = agrs_parse(["--token-engine=multipass"])
+    plugins = _main.get_ontoken_plugins(args)
+    assert len(_main.get_plugins_passes(args, plugins)) == len(plugins)
+
+    args = agrs_parse(["--token-engine=fused"])
+    plugins = _main.get_ontoken_plugins(args)
+    assert len(_main.get_plugins_passes(args, plugins)) == 1
+
+    # save-values-to-file needs tokens of changed source
+    args = agrs_parse(["--token-engine=fused", "--save-values-to-file"])
+    plugins = _main.get_ontoken_plugins(args)
+    passes = _main.get_plugins_passes(args, plugins)
+    assert [len(x) for x in passes] == [len(plugins) - 1, 1]
+
+
+def test_get_noqa_index():
+    source = "a = 'a'  # noqa\nb = '''b\n'''  # NOQA: E501\n# flake8: noqa: E501\nc = 'c'  # comment\n"
+    noqa = _main.get_noqa_index(_main.get_tokens(source))
+    assert noqa.file is True
+    assert noqa.lines == {1, 3}
+
+    noqa = _main.get_noqa_index(_main.get_tokens("a = 'a'\n"))
+    assert noqa.file is False
+    assert noqa.lines == set()
+
+
+def test_format_code__noqa_line():
+    from autopep8_quotes.args import agrs_parse
+
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args._read_filename = "noqa.py"
+    source = "a = 'a'  # noqa\r\nb = ('b',\r\n     'b')  # noqa\r\nc = 'c'\r\n"
+    expect = "a = 'a'  # noqa\r\nb = (\"b\",\r\n     'b')  # noqa\r\nc = \"c\"\r\n"
+    assert expect == _main.format_code(source=source, args=args, filename="noqa.py")
+
+
+def test_format_code_pass__token_types():
+    import tokenize
+
+    from autopep8_quotes._util._modules import main_formatter
+    from autopep8_quotes.args import agrs_parse
+
+    class counter(main_formatter):
+        def __init__(self, token_types):
+            super().__init__()
+            self.token_types = token_types
+            self.types = []
+
+        def parse(self, token, *_args, **kwargs):
+            self.types.append(token.type)
+            return token
+
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args._read_filename = "token_types.py"
+    plugin_all, plugin_string = counter(None), counter({tokenize.STRING})
+    plugins = [(SimpleNamespace(name="all", args=[], kwargs={}), plugin_all), (SimpleNamespace(name="string", args=[], kwargs={}), plugin_string)]
+    source = "a = 'a' + f(\"b\")\n"
+    assert source == _main._format_code_pass(source, args, "token_types.py", plugins)
+    assert len(plugin_all.types) == len(_main.get_tokens(source))
+    assert plugin_string.types == [tokenize.STRING, tokenize.STRING]
+
+
+def test_format_code_pass__changed_modified_tokens():
+    import tokenize
+
+    from autopep8_quotes._util._modules import main_formatter
+    from autopep8_quotes.args import agrs_parse
+
+    class remove_last_newline(main_formatter):
+        def __init__(self):
+            super().__init__()
+            self.token_types = {tokenize.ENDMARKER}
+
+        def parse(self, token, *_args, args, **kwargs):
+            args._modified_tokens.pop()
+            return token
+
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args._read_filename = "changed_tokens.py"
+    plugins = [(SimpleNamespace(name="remove-last-newline", args=[], kwargs={}), remove_last_newline())]
+    # Source is rebuilt from args._modified_tokens
+    assert "a = 1" == _main._format_code_pass("a = 1\n", args, "changed_tokens.py", plugins)
@@ -0,0 +1,64 @@
+import pytest  # type: ignore
+
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes._util._main import get_ontoken_plugins
+from autopep8_quotes._util._prefilter import is_prefilter_enabled
+from autopep8_quotes._util._prefilter import is_source_clean
+from autopep8_quotes.args import agrs_parse
+
+testdata_is_source_clean = []
+testdata_is_source_clean.append(('a = "a"\r\n', True))
+testdata_is_source_clean.append(('a = """a\r\n\'\'\'"""  # \'comment\'\r\n', True))
+testdata_is_source_clean.append(('a = rb"a" + f"{b}"\r\n\r\nif"a":\r\n    pass\r\n', True))
+testdata_is_source_clean.append(("a = 'a'\r\n", False))
+testdata_is_source_clean.append(('a = "a"\n', False))
+testdata_is_source_clean.append(('a = "a"  \r\n', False))
+testdata_is_source_clean.append(('a = "a"\r\n\r\n', False))
+testdata_is_source_clean.append(('a = "a"\r\n  \r\nb = 1\r\n', False))
+testdata_is_source_clean.append(('a = "a\\"b"\r\n', False))
+testdata_is_source_clean.append(('a = B"a"\r\n', False))
+testdata_is_source_clean.append(('a = u"a"\r\n', False))
+testdata_is_source_clean.append(('a = f"{b[\'c\']}"\r\n', False))
+testdata_is_source_clean.append(('a = 1if"a"else\'b\'\r\n', False))
+testdata_is_source_clean.append(('a = "a\r\n', False))
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("source,expect", testdata_is_source_clean)  # type: ignore
+def test_is_source_clean(source: str, expect: bool) -> None:
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args._read_filename = "prefilter.py"
+    plugins = get_ontoken_plugins(args)
+    assert is_source_clean(source, args, plugins) == expect
+    if expect:
+        args.no_prefilter = True
+        assert format_code(source, args=args, filename="prefilter.py") == source
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_source_clean__disabled_plugins() -> None:
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args.fix_end_file_lines = False
+    args.normalize_string_quotes = False
+    plugins = get_ontoken_plugins(args)
+    assert is_source_clean("a = 'a'\n", args, plugins)
+    assert not is_source_clean("a = U'a'\n", args, plugins)
+
+
+@pytest.mark.basic  # type: ignore
+def test_is_prefilter_enabled() -> None:
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    assert is_prefilter_enabled(args, get_ontoken_plugins(args))
+    args = agrs_parse(["--print-disable", "--no-cache", "--nsq-log-transform"])
+    assert not is_prefilter_enabled(args, get_ontoken_plugins(args))
+    args = agrs_parse(["--print-disable", "--no-cache", "--save-values-to-file"])
+    assert not is_prefilter_enabled(args, get_ontoken_plugins(args))
+
+
+@pytest.mark.basic  # type: ignore
+def test_format_code__prefilter_stats() -> None:
+    args = agrs_parse(["--print-disable", "--no-cache"])
+    args._read_filename = "prefilter.py"
+    assert format_code('a = "a"\r\n', args=args, filename="prefilter.py") == 'a = "a"\r\n'
+    assert format_code("a = 'a'\r\n", args=args, filename="prefilter.py") == 'a = "a"\r\n'
+    assert args._stats["prefilter.skipped"] == 1
@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes import _main
+from autopep8_quotes._util._profile import new_profile
+from autopep8_quotes._util._profile import print_profile
+from autopep8_quotes._util._profile import profile_add
+from autopep8_quotes._util._profile import profile_merge
+from autopep8_quotes._util._profile import profile_stage
+
+
+@pytest.mark.basic  # type: ignore
+def test_profile_add() -> None:
+    args = SimpleNamespace(profile=True)
+    args._profile = new_profile(args)
+    profile_add(args, "stage.read", 0.5)
+    profile_add(args, "stage.read", 0.25, calls=2)
+    profile_merge(args, {"stage.read": [1, 0.25], "ontoken.x": [10, 1.0]})
+    profile_merge(args, None)
+    with profile_stage(args, "stage.save"):
+        pass
+    assert args._profile["stage.read"] == [4, 1.0]
+    assert args._profile["ontoken.x"] == [10, 1.0]
+    assert args._profile["stage.save"][0] == 1
+
+    # Disabled profile: nothing is measured
+    args = SimpleNamespace(profile=False)
+    args._profile = new_profile(args)
+    profile_add(args, "stage.read", 0.5)
+    with profile_stage(args, "stage.save"):
+        pass
+    assert args._profile is None
+
+
+@pytest.mark.basic  # type: ignore
+def test_print_profile(capsys: Any) -> None:
+    args = SimpleNamespace(profile=True, profile_format="table", _profile={"a": [1, 0.5], "b": [4, 2.0]})
+    print_profile(args)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Profile:"
+    # Sorted by total time
+    assert lines[2].split()[:3] == ["b", "4", "2.0000"]
+    assert lines[3].split()[:3] == ["a", "1", "0.5000"]
+
+    args.profile_format = "json"
+    print_profile(args)
+    assert json.loads(capsys.readouterr().out) == {"b": {"calls": 4, "seconds": 2.0}, "a": {"calls": 1, "seconds": 0.5}}
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("jobs", ["1", "2"])  # type: ignore
+def test__main_profile(capsys: Any, jobs: str) -> None:
+    args = ["--check-soft", "--no-cache", "--no-prefilter", "--profile", "--profile-format=json", f"--jobs={jobs}",
+            "--files=tests/good/tests_001_raw.py", "tests/good/tests_002_raw.py"]
+    _main(args=args, standard_out="sys.stdout", standard_error="sys.stderr")
+    lines = [x for x in capsys.readouterr().out.splitlines() if x.startswith("{")]
+    profile = json.loads(lines[-1])
+    for name in ["stage.read", "stage.detect_encoding", "stage.tokenize", "stage.transform", "stage.splice", "stage.save",
+                 "onfile.check_soft"]:
+        assert profile[name]["calls"] == 2, name
+    assert profile["ontoken.normalize_string_quotes"]["calls"] > 2
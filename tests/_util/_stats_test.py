@@ -0,0 +1,14 @@
+import pytest  # type: ignore
+
+from autopep8_quotes._util._stats import get_hit_rates
+from autopep8_quotes._util._stats import new_stats
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_hit_rates() -> None:
+    stats = new_stats()
+    stats["cache.hit"] = 3
+    stats["cache.miss"] = 1
+    stats["nsq.memo.hit"] = 2
+    stats["format_file.format_passes"] = 5
+    assert get_hit_rates(stats) == {"cache.hit_rate": 0.75, "nsq.memo.hit_rate": 1.0}
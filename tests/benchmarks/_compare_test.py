@@ -0,0 +1,30 @@
+import json
+from typing import Any
+
+import pytest  # type: ignore
+from benchmarks.compare import compare_results
+from benchmarks.compare import main
+
+
+@pytest.mark.basic  # type: ignore
+def test_compare_results() -> None:
+    baseline = {"a": {"files_per_s": 100.0, "peak_memory_mb": 10.0}, "old": {"files_per_s": 1.0}}
+    current = {"a": {"files_per_s": 85.0, "peak_memory_mb": 10.5}, "new": {"files_per_s": 1.0}}
+    changes = {change.metric: change for change in compare_results(baseline, current, threshold=0.1)}
+    assert set(changes) == {"files_per_s", "peak_memory_mb"}
+    # Throughput is lower by 15%, memory is higher by 5%
+    assert changes["files_per_s"].is_regression
+    assert not changes["peak_memory_mb"].is_regression
+    assert not compare_results(baseline, current, threshold=0.2)[0].is_regression
+
+
+@pytest.mark.basic  # type: ignore
+def test_compare_main(tmp_path: Any, capsys: Any) -> None:
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps({"a": {"mb_per_s": 1.0}}))
+    current.write_text(json.dumps({"a": {"mb_per_s": 0.5}}))
+    assert main([str(baseline), str(current)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    assert main([str(baseline), str(current), "--threshold", "0.6"]) == 0
+    assert main([str(baseline), str(baseline)]) == 0
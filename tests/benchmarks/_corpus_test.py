@@ -0,0 +1,69 @@
+import io
+import os
+from typing import Any
+
+import ast
+import pytest  # type: ignore
+import tokenize
+from benchmarks import corpus
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes.args import agrs_parse
+
+
+def is_tokenized(source: str) -> bool:
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return False
+    return all(token.type != tokenize.ERRORTOKEN for token in tokens)
+
+
+@pytest.mark.basic  # type: ignore
+def test_corpus_deterministic() -> None:
+    options = corpus.get_options(files=5)
+    tree = list(corpus.iter_tree(1, options))
+    assert tree == list(corpus.iter_tree(1, options))
+    assert tree != list(corpus.iter_tree(2, options))
+    # File depends only on seed and index: small tree is start of large tree
+    assert list(corpus.iter_tree(1, corpus.get_options(files=3))) == tree[:3]
+    assert len({path for path, source in tree}) == 5
+    with pytest.raises(TypeError):
+        corpus.get_options(unknown=1)
+
+
+@pytest.mark.basic  # type: ignore
+def test_corpus_options() -> None:
+    sources = [source for path, source in corpus.iter_tree(0, corpus.get_options(files=20, noqa=0.0, errors=0.0))]
+    for source in sources:
+        ast.parse(source)
+        assert "noqa" not in source
+
+    options = corpus.get_options(files=20, lines=50, string_density=1.0, prefixes=["U"], quotes=["'"], noqa=1.0)
+    for path, source in corpus.iter_tree(0, options):
+        lines = source.splitlines()
+        assert len(lines) == 50
+        assert all(line.endswith("  # noqa") for line in lines[4:])
+        assert all(" = U'" in line for line in lines[4:])
+
+    sources = [source for path, source in corpus.iter_tree(0, corpus.get_options(files=20, errors=1.0))]
+    assert not any(is_tokenized(source) for source in sources)
+
+
+@pytest.mark.basic  # type: ignore
+def test_corpus_main(tmp_path: Any, capsys: Any) -> None:
+    root = str(tmp_path / "tree")
+    assert corpus.main(["--out", root, "--files", "30", "--lines", "20", "--errors", "0.3", "--prefixes", ",u,b"]) == 0
+    assert "Files: 30" in capsys.readouterr().out
+    paths = [os.path.join(dirname, name) for dirname, dirs, names in os.walk(root) for name in names]
+    assert len(paths) == 30
+
+    # Files which can't be tokenized are not broken by formatting
+    args = agrs_parse(["--print-disable", "--no-cache"], _standard_out="sys.stdout")
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        result = format_code(source, args=file_context(args, _read_filename=path), filename=path)
+        if not is_tokenized(source):
+            assert result.splitlines()[-1] == source.splitlines()[-1]
@@ -0,0 +1,36 @@
+import time
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes.args import agrs_parse
+
+
+def get_corpus(copies: int = 3) -> List[str]:
+    """Sources like tests/good/tests_001_raw.py, each file is repeated several times"""
+    corpus = []
+    for fname in ["tests/good/tests_001_raw.py", "tests/good/tests_002_raw.py", "tests/good/test.py"]:
+        with open(fname, encoding="utf-8", newline="") as f:
+            corpus.append(f.read() * copies)
+    return corpus
+
+
+def run_engine(engine: str, corpus: List[str]) -> Any:
+    args = agrs_parse([f"--token-engine={engine}", "--print-disable"])
+    args._read_filename = "benchmark.py"
+    start = time.perf_counter()
+    result = [format_code(source, args=args, filename="benchmark.py") for source in corpus]
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__token_engine() -> None:
+    corpus = get_corpus()
+
+    time_multipass, result_multipass = run_engine("multipass", corpus)
+    time_fused, result_fused = run_engine("fused", corpus)
+    print(f"\ntoken engine: multipass {time_multipass:.3f}s, fused {time_fused:.3f}s, speedup {time_multipass / time_fused:.2f}x")
+
+    assert result_fused == result_multipass
@@ -0,0 +1,37 @@
+import time
+from typing import Any
+from typing import Callable
+
+import pytest  # type: ignore
+
+from autopep8_quotes.modules.formater.normalize_string_quotes import formatter
+
+
+def get_body(size: int) -> str:
+    """Body of literal which could be changed only by escaping symbol by symbol"""
+    part = "ab\\'\\'\\'c"
+    return part * (size // len(part))
+
+
+def run(func: Callable[..., Any], body: str) -> Any:
+    start = time.perf_counter()
+    result = func(body, "", '"""')
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__escape_body() -> None:
+    fmt = formatter()
+    timing = {}
+    for size in [1000, 10000, 100000]:
+        timing[size], result = run(fmt.escape_body, get_body(size))
+        assert len(result) > size // 2
+
+    time_bruteforce, result_bruteforce = run(fmt.bruteforce_body, get_body(1000))
+    assert result_bruteforce == run(fmt.escape_body, get_body(1000))[1]
+    print(f"\nescape_body: 1KB {timing[1000]:.5f}s, 10KB {timing[10000]:.5f}s, 100KB {timing[100000]:.5f}s, "
+          f"bruteforce_body 1KB {time_bruteforce:.5f}s")
+
+    assert timing[1000] < time_bruteforce
+    # Linear: 100 times longer body takes much less than 100**2 times more time
+    assert timing[100000] < max(timing[1000], 0.0001) * 1000
@@ -0,0 +1,45 @@
+import time
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes.api import Formatter
+from autopep8_quotes.args import agrs_parse
+
+calls = 100
+
+
+def get_sources() -> List[str]:
+    """Small generated modules like in code-generation service"""
+    return [f"def func_{i}():\r\n    return {{'key_{i}': u'value_{i}', \"other\": '{i}'}}\r\n" for i in range(calls)]
+
+
+def run_parse_each(sources: List[str]) -> Any:
+    """Options and plugins are resolved on each call"""
+    start = time.perf_counter()
+    result = []
+    for source in sources:
+        args = agrs_parse(["--print-disable"])
+        args._read_filename = "benchmark.py"
+        result.append(format_code(source, args=args, filename="benchmark.py"))
+    return time.perf_counter() - start, result
+
+
+def run_formatter(sources: List[str]) -> Any:
+    start = time.perf_counter()
+    formatter = Formatter(print_disable=True)
+    result = [formatter.format_source(source).formatted for source in sources]
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__formatter() -> None:
+    sources = get_sources()
+    time_parse, result_parse = run_parse_each(sources)
+    time_formatter, result_formatter = run_formatter(sources)
+    print(f"\n{calls} calls: agrs_parse on each call {time_parse:.3f}s, Formatter {time_formatter:.3f}s, "
+          f"speedup {time_parse / time_formatter:.1f}x")
+
+    assert result_formatter == result_parse
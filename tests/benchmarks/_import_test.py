@@ -0,0 +1,36 @@
+import json
+import subprocess  # nosec
+import sys
+from typing import Any
+
+import pytest  # type: ignore
+
+# Modules which are slow to import and not needed to parse args
+slow_modules = ["pkg_resources", "lib2to3", "difflib", "concurrent.futures"]
+
+code = f"""
+import json
+import sys
+from typing import Any
+import time
+start = time.perf_counter()
+from autopep8_quotes.args import agrs_parse
+agrs_parse(["--print-disable"])
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": [m for m in {slow_modules!r} if m in sys.modules]}}))
+"""
+
+
+def run_cold_start() -> Any:
+    output = subprocess.check_output([sys.executable, "-c", code])  # nosec
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__import_time() -> None:
+    result = min((run_cold_start() for _ in range(3)), key=lambda x: x["elapsed"])
+    print(f"\ncold start: import and parse args {result['elapsed']:.3f}s")
+
+    assert result["modules"] == []
+    # Was about 0.25s with pkg_resources, now it is about 0.08s
+    assert result["elapsed"] < 0.5
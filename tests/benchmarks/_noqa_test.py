@@ -0,0 +1,50 @@
+import time
+from typing import Any
+from typing import Callable
+from typing import List
+
+import pytest  # type: ignore
+import tokenize
+
+from autopep8_quotes._util._main import get_noqa_index
+from autopep8_quotes._util._main import get_tokens
+from autopep8_quotes._util._main import group_tokens_by_line
+from autopep8_quotes._util._main import search_comment_code
+
+
+def get_source(lines: int = 40, strings: int = 100) -> str:
+    """Long lines with many tokens, every second line has noqa comment"""
+    source = []
+    for i in range(lines):
+        values = ", ".join(f"'value_{j}'" for j in range(strings))
+        comment = "  # noqa: E501" if i % 2 else "  # some comment"
+        source.append(f"x_{i} = [{values}]{comment}\r\n")
+    return "".join(source)
+
+
+def skip_by_search(all_tokens: List[tokenize.TokenInfo]) -> List[bool]:
+    """Previous dispatch: scan all tokens of line for each token"""
+    return [search_comment_code(line_tokens, search="noqa", filename="benchmark.py") for token, line_tokens in group_tokens_by_line(all_tokens)]
+
+
+def skip_by_index(all_tokens: List[tokenize.TokenInfo]) -> List[bool]:
+    noqa = get_noqa_index(all_tokens)
+    return [token.end[0] in noqa.lines for token, line_tokens in group_tokens_by_line(all_tokens)]
+
+
+def run(func: Callable[..., Any], all_tokens: List[tokenize.TokenInfo]) -> Any:
+    start = time.perf_counter()
+    result = func(all_tokens)
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__noqa_index() -> None:
+    all_tokens = get_tokens(get_source())
+
+    time_search, result_search = run(skip_by_search, all_tokens)
+    time_index, result_index = run(skip_by_index, all_tokens)
+    print(f"\nnoqa on {len(all_tokens)} tokens: search per token {time_search:.3f}s, index {time_index:.3f}s, "
+          f"speedup {time_search / time_index:.1f}x")
+
+    assert result_index == result_search
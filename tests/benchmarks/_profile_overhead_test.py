@@ -0,0 +1,38 @@
+import time
+from typing import Any
+from typing import List
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes.args import agrs_parse
+
+
+def get_corpus(copies: int = 3) -> List[str]:
+    corpus = []
+    for fname in ["tests/good/tests_001_raw.py", "tests/good/tests_002_raw.py", "tests/good/test.py"]:
+        with open(fname, encoding="utf-8", newline="") as f:
+            corpus.append(f.read() * copies)
+    return corpus
+
+
+def run(argv: List[str], corpus: List[str], repeat: int = 5) -> Any:
+    args = agrs_parse(["--print-disable", "--no-prefilter"] + argv)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [format_code(source, args=file_context(args, _read_filename="benchmark.py"), filename="benchmark.py") for source in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, result, args
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__profile_overhead() -> None:
+    corpus = get_corpus()
+    time_off, result_off, _ = run([], corpus)
+    time_on, result_on, args = run(["--profile"], corpus)
+    print(f"\nprofile: disabled {time_off:.3f}s, enabled {time_on:.3f}s, overhead {time_on / time_off - 1:.1%}")
+
+    assert result_on == result_off
+    assert args._profile["stage.transform"][0] > 0
@@ -0,0 +1,50 @@
+import datetime
+import os
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._format import save_values_to_file
+from autopep8_quotes._util._io import open_with_encoding
+from autopep8_quotes._util._log_sink import close_logs
+
+calls = 20000
+
+
+def save_values_to_file_open_each(args: Any, name: str, token_dict: Any) -> None:
+    """Previous version: makedirs, open, write and close on each token"""
+    os.makedirs("log", exist_ok=True)
+    fname = f"log/autopep8_quotes.{name}.{args._datetime_start.strftime('%Y%m%d %H%M%S')}.txt"
+    with open_with_encoding(fname, mode="a", encoding="utf-8") as output_file:
+        output_file.write("\n")
+        output_file.write("# " + token_dict["filename"] + ":" + token_dict["pos1"])
+        output_file.write("\n")
+        output_file.write("a_1 = " + token_dict["token_string"])
+        output_file.write("\n")
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__save_values_to_file(tmp_path: Any, monkeypatch: Any) -> None:
+    monkeypatch.chdir(tmp_path)
+    args = SimpleNamespace(_datetime_start=datetime.datetime(2020, 1, 1), print_disable=True)
+    tokens = [{"filename": "a.py", "pos1": f"({i}:0 - {i}:3)", "token_string": f"'value_{i}'"} for i in range(calls)]
+
+    start = time.perf_counter()
+    for token_dict in tokens:
+        save_values_to_file_open_each(args, "open_each", token_dict)
+    time_open_each = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for token_dict in tokens:
+        save_values_to_file(args=args, name="sink", input_list=[token_dict])
+    # Time includes writing of all records
+    close_logs()
+    time_sink = time.perf_counter() - start
+    print(f"\n{calls} tokens: open on each token {time_open_each:.3f}s, log sink {time_sink:.3f}s, "
+          f"speedup {time_open_each / time_sink:.1f}x")
+
+    with open("log/autopep8_quotes.open_each.20200101 000000.txt", encoding="utf-8") as f1:
+        with open("log/autopep8_quotes.sink.20200101 000000.txt", encoding="utf-8") as f2:
+            assert f1.read() == f2.read()
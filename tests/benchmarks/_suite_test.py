@@ -0,0 +1,106 @@
+import io
+import os
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import pytest  # type: ignore
+import tokenize
+from benchmarks import corpus
+
+from autopep8_quotes._util._context import file_context
+from autopep8_quotes._util._files import iter_files
+from autopep8_quotes._util._main import format_code
+from autopep8_quotes._util._main import format_file
+from autopep8_quotes.args import agrs_parse
+from autopep8_quotes.modules.formater import normalize_string_quotes
+
+
+def count_tokens(sources: List[str]) -> int:
+    return sum(len(list(tokenize.generate_tokens(io.StringIO(source).readline))) for source in sources)
+
+
+def get_metrics(files: int, size: int, tokens: int, seconds: float, peak_memory: int) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+    metrics["files"] = files
+    metrics["bytes"] = size
+    metrics["tokens"] = tokens
+    metrics["seconds"] = seconds
+    metrics["files_per_s"] = files / seconds
+    metrics["tokens_per_s"] = tokens / seconds
+    metrics["mb_per_s"] = size / seconds / 1e6
+    metrics["peak_memory_mb"] = peak_memory / 1e6
+    return metrics
+
+
+def measure(func: Callable[[], Any], repeat: int = 2) -> Any:
+    """Best time of several runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        # Results of previous run should not be reused
+        normalize_string_quotes.memo.clear()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure_memory(func: Callable[[], Any]) -> int:
+    """Peak memory of separate run: tracemalloc slows down run"""
+    normalize_string_quotes.memo.clear()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.benchmark  # type: ignore
+@pytest.mark.parametrize("name", sorted(corpus.corpora))  # type: ignore
+def test_benchmark__format_code(name: str, benchmark_results: Dict[str, Any]) -> None:
+    sources = corpus.corpora[name]()
+    assert sources == corpus.corpora[name](), "corpus is not deterministic"
+    args = agrs_parse(["--print-disable", "--no-cache"], _standard_out="sys.stdout")
+
+    def run() -> List[str]:
+        return [format_code(source, args=file_context(args, _read_filename=f"{name}.py"), filename=f"{name}.py") for source in sources]
+
+    seconds, result = measure(run)
+    # Files are formatted one by one: memory of the largest file
+    largest = max(sources, key=len)
+    peak_memory = measure_memory(lambda: format_code(largest, args=file_context(args, _read_filename=f"{name}.py"), filename=f"{name}.py"))
+    metrics = get_metrics(len(sources), sum(len(source.encode("utf-8")) for source in sources), count_tokens(sources), seconds, peak_memory)
+    benchmark_results[f"format_code.{name}"] = metrics
+    print(f"\n{name}: {metrics['files_per_s']:.1f} files/s, {metrics['tokens_per_s']:.0f} tokens/s, "
+          f"{metrics['mb_per_s']:.3f} MB/s, peak memory {metrics['peak_memory_mb']:.1f} MB")
+    assert len(result) == len(sources)
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__format_files(tmp_path: Any, benchmark_results: Dict[str, Any]) -> None:
+    """All pipeline on files: discovery, read, format and check"""
+    sources = corpus.many_small_files()
+    root = str(tmp_path)
+    for i, source in enumerate(sources):
+        path = os.path.join(root, f"pkg_{i // 100}")
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, f"module_{i}.py"), "w", encoding="utf-8") as f:
+            f.write(source)
+    args = agrs_parse(["--print-disable", "--no-cache", "--check-soft", "--recursive", "--files", root], _standard_out="sys.stdout")
+
+    def run() -> int:
+        changed = 0
+        for name in iter_files(args):
+            changed += bool(format_file(args=file_context(args, _read_filename=name, _diff_files_count=0)))
+        return changed
+
+    seconds, changed = measure(run)
+    assert changed == len(sources)
+    peak_memory = measure_memory(run)
+    metrics = get_metrics(len(sources), sum(len(source.encode("utf-8")) for source in sources), count_tokens(sources), seconds, peak_memory)
+    benchmark_results["format_files.many_small"] = metrics
+    print(f"\nfiles: {metrics['files_per_s']:.1f} files/s, {metrics['mb_per_s']:.3f} MB/s, peak memory {metrics['peak_memory_mb']:.1f} MB")
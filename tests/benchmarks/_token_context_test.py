@@ -0,0 +1,55 @@
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._format import get_token_dict
+
+tokens_count = 30000
+
+
+def get_token_dict_eager(token_type: int, token_string: str, start: Tuple[int, int],
+                         end: Tuple[int, int], line: str,
+                         filename: str) -> Dict[str, Any]:
+    """Previous version of get_token_dict(): all position strings are formatted at once"""
+    _dict: Dict[str, Any] = {}
+    _dict["token_type"] = token_type
+    _dict["token_string"] = token_string
+    _dict["start"] = start
+    _dict["end"] = end
+    _dict["line"] = line
+    _dict["filename"] = filename
+    _dict["text"] = f"Line {start[0]}, pos {start[1]} - line {end[0]}, pos {end[1]}: {token_string}"
+    _dict["pos"] = f"Line:pos ({start[0]}:{start[1]} - {end[0]}:{end[1]})"
+    _dict["pos1"] = f"({start[0]}:{start[1]} - {end[0]}:{end[1]})"
+    _dict["pos2"] = f"Line {start[0]}, pos {start[1]} - line {end[0]}, pos {end[1]}"
+    return _dict
+
+
+def run(func: Callable[..., Any]) -> Any:
+    """Create contexts like _format_code() does (plugins read only token string), return time and allocated bytes"""
+    line = "a = 'a'\n"
+    tracemalloc.start()
+    start = time.perf_counter()
+    contexts = [func(3, "'a'", (i, 4), (i, 7), line, "benchmark.py") for i in range(1, tokens_count + 1)]
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert all(x["token_string"] == "'a'" for x in contexts)
+    return elapsed, allocated
+
+
+@pytest.mark.benchmark  # type: ignore
+def test_benchmark__token_context() -> None:
+    time_eager, allocated_eager = run(get_token_dict_eager)
+    time_lazy, allocated_lazy = run(get_token_dict)
+    per_million = 1000000 / tokens_count
+    print(f"\ntoken context per 1M tokens: dict {allocated_eager * per_million / 2**20:.0f}MB, "
+          f"slots {allocated_lazy * per_million / 2**20:.0f}MB; "
+          f"time (with tracemalloc) dict {time_eager * per_million:.2f}s, slots {time_lazy * per_million:.2f}s")
+
+    assert allocated_lazy < allocated_eager / 2
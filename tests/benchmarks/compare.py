@@ -0,0 +1,78 @@
+"""Compare results of benchmark suite with saved baseline.
+
+    python -m pytest -m benchmark tests/benchmarks
+    cp build/benchmarks.json baseline.json
+    ... change code, run benchmarks again ...
+    python tests/benchmarks/compare.py baseline.json build/benchmarks.json --threshold 0.1
+
+Exit code is 1 if any metric is worse than baseline by more than threshold.
+"""
+import argparse
+import json
+import sys
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+# Metrics which are compared: True if higher value is better
+metrics = {
+    "files_per_s": True,
+    "tokens_per_s": True,
+    "mb_per_s": True,
+    "peak_memory_mb": False,
+}
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[SimpleNamespace]:
+    """Changes of metrics of benchmarks which exist in both results"""
+    changes = []
+    for name in sorted(set(baseline) & set(current)):
+        for metric, higher_is_better in metrics.items():
+            old = baseline[name].get(metric)
+            new = current[name].get(metric)
+            if not old or new is None:
+                continue
+            change = SimpleNamespace()
+            change.name = name
+            change.metric = metric
+            change.baseline = old
+            change.current = new
+            change.ratio = new / old - 1
+            worse = -change.ratio if higher_is_better else change.ratio
+            change.is_regression = worse > threshold
+            changes.append(change)
+    return changes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", help="Saved results (json)")
+    parser.add_argument("current", help="New results (json)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed relative regression of each metric, 0.1 is 10%%")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    changes = compare_results(baseline, current, args.threshold)
+    print(f"{'benchmark':<30} {'metric':<16} {'baseline':>14} {'current':>14} {'change':>9}")
+    for change in changes:
+        mark = "  REGRESSION" if change.is_regression else ""
+        print(f"{change.name:<30} {change.metric:<16} {change.baseline:>14.2f} {change.current:>14.2f} {change.ratio:>+9.1%}{mark}")
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name:<30} only in {'baseline' if name in baseline else 'current'}")
+
+    regressions = [change for change in changes if change.is_regression]
+    if regressions:
+        print(f"Regressions: {len(regressions)} (threshold {args.threshold:.0%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+import json
+import os
+from typing import Any
+from typing import Dict
+
+import pytest  # type: ignore
+
+# Results of benchmark suite are saved here, compare.py diffs them against saved baseline
+results_path = os.environ.get("AUTOPEP8_QUOTES_BENCHMARK_JSON", "build/benchmarks.json")
+
+
+@pytest.fixture(autouse=True)  # type: ignore
+def collect_types_fixture() -> Any:
+    # Collection of types (tests/conftest.py) slows down every call: disable it for benchmarks
+    yield
+
+
+@pytest.fixture(scope="session")  # type: ignore
+def benchmark_results() -> Any:
+    """Metrics of benchmarks by name, they are written as json at the end of session"""
+    results: Dict[str, Any] = {}
+    yield results
+    if results:
+        os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+        with open(results_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
@@ -0,0 +1,240 @@
+"""Deterministic synthetic sources for benchmarks: same seed gives same corpus.
+
+Tree of files for scale tests is generated without fixtures in repository:
+
+    python tests/benchmarks/corpus.py --out build/corpus --files 100000 --seed 1
+    python tests/benchmarks/corpus.py --out build/corpus --files 10 --prefixes u,U,b,rb --noqa 0.1 --errors 0.05
+
+Each file depends only on seed and its index: trees of 10 and 1M files with same seed start with same files.
+"""
+import argparse
+import os
+import random
+import sys
+from types import SimpleNamespace
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+words = ["alpha", "beta", "gamma", "delta", "value", "name", "key", "path", "user", "item", "data", "text"]
+prefixes = ["", "", "", "", "u", "b", "r", "f", "U", "R", "B", "F", "rb", "Rb", "br"]
+quotes = ["'", '"']
+
+
+def make_literal(rng: random.Random, escapes: int = 0) -> str:
+    """Short string literal with random prefix and quote"""
+    prefix = rng.choice(prefixes)
+    quote = rng.choice(quotes)
+    pieces = [rng.choice(words) for _ in range(rng.randint(1, 4))]
+    for _ in range(escapes):
+        # Escapes are inserted between words: they are valid with any quote and prefix
+        pieces.insert(rng.randint(0, len(pieces)), rng.choice(["\\'", '\\"', "\\\\", "\\n", "\\t"]))
+    body = " ".join(pieces)
+    if "f" in prefix.lower():
+        body += " {value}"
+    if "r" in prefix.lower():
+        # Raw string can't end with backslash
+        body += " x"
+    return f"{prefix}{quote}{body}{quote}"
+
+
+def make_function(rng: random.Random, index: int, strings: int, escapes: int = 0) -> str:
+    lines = [f"def func_{index}(value):", f'    """Docstring of func_{index}."""']
+    for i in range(strings):
+        lines.append(f"    var_{i} = {make_literal(rng, escapes=escapes)}")
+    lines.append("    return value")
+    lines.append("")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def make_file(rng: random.Random, functions: int, strings: int, escapes: int = 0) -> str:
+    parts = ["import os", "", ""]
+    parts.extend(make_function(rng, i, strings, escapes=escapes) for i in range(functions))
+    return "\n".join(parts)
+
+
+def many_small_files(seed: int = 0, count: int = 300) -> List[str]:
+    """Many files with a few strings"""
+    rng = random.Random(seed)
+    return [make_file(rng, functions=2, strings=3) for _ in range(count)]
+
+
+def huge_files(seed: int = 0, count: int = 1) -> List[str]:
+    """A few files of ~200KB"""
+    rng = random.Random(seed)
+    return [make_file(rng, functions=500, strings=10) for _ in range(count)]
+
+
+def string_dense_files(seed: int = 0, count: int = 3) -> List[str]:
+    """Files which are almost only strings"""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        items = ", ".join(f"{make_literal(rng)}: {make_literal(rng)}" for _ in range(1000))
+        result.append(f"DATA = {{{items}}}\n")
+    return result
+
+
+def long_escaped_files(seed: int = 0, count: int = 10) -> List[str]:
+    """Long literals with many escaped quotes"""
+    rng = random.Random(seed)
+    return [make_file(rng, functions=20, strings=5, escapes=40) for _ in range(count)]
+
+
+def fstring_files(seed: int = 0, count: int = 20) -> List[str]:
+    """Code where most of strings are f-strings"""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        lines = []
+        for i in range(200):
+            quote = rng.choice(quotes)
+            prefix = rng.choice(["f", "F", "rf", "fr"])
+            lines.append(f"x_{i} = {prefix}{quote}{rng.choice(words)} {{value}} {{value!r:>10}} {rng.choice(words)}{quote}")
+        result.append("\n".join(lines) + "\n")
+    return result
+
+
+corpora: Dict[str, Callable[..., List[str]]] = {
+    "many_small": many_small_files,
+    "huge": huge_files,
+    "string_dense": string_dense_files,
+    "long_escaped": long_escaped_files,
+    "fstring_heavy": fstring_files,
+}
+
+
+# Lines which make tokenize fail (ERRORTOKEN or TokenError), they are added to the end of file
+error_lines = [
+    "x = 'unterminated",
+    "x = (1,",
+    'x = """unterminated',
+    "x = $",
+]
+
+
+def get_options(**kwargs: Any) -> SimpleNamespace:
+    """Options of generated tree, kwargs change defaults.
+
+    files: count of files.
+    lines: count of lines in file.
+    string_density: part of lines which are assignments of string.
+    prefixes: prefixes of strings with equal chances ("" is string without prefix).
+    quotes: quotes of strings with equal chances.
+    escape_density: part of strings with escaped quotes and backslashes.
+    noqa: part of lines with "# noqa" comment.
+    errors: part of files which can't be tokenized.
+    """
+    options = SimpleNamespace()
+    options.files = 100
+    options.lines = 100
+    options.string_density = 0.5
+    options.prefixes = ["", "u", "b", "r", "f", "U", "B", "R", "F", "rb", "Rb", "br", "rf", "Fr"]
+    options.quotes = ["'", '"', "'''", '"""']
+    options.escape_density = 0.1
+    options.noqa = 0.01
+    options.errors = 0.0
+    for key, value in kwargs.items():
+        if key not in options.__dict__:
+            raise TypeError(f"Unknown option: {key}")
+        setattr(options, key, value)
+    return options
+
+
+def make_string(rng: random.Random, options: SimpleNamespace) -> str:
+    """String literal with prefix and quote from options"""
+    prefix = rng.choice(options.prefixes)
+    quote = rng.choice(options.quotes)
+    pieces = [rng.choice(words) for _ in range(rng.randint(1, 6))]
+    if rng.random() < options.escape_density:
+        for _ in range(rng.randint(1, 4)):
+            pieces.insert(rng.randint(0, len(pieces)), rng.choice(["\\'", '\\"', "\\\\", "\\n"]))
+    if "f" in prefix.lower():
+        pieces.append("{value}")
+    # Word at the end: raw string can't end with backslash, triple quoted string can't end with its quote char
+    pieces.append(rng.choice(words))
+    return f"{prefix}{quote}{' '.join(pieces)}{quote}"
+
+
+def generate_source(seed: int, index: int, options: SimpleNamespace) -> str:
+    """Source of file with index: it depends only on seed and index"""
+    rng = random.Random(seed * 1000003 + index)
+    lines = ["import os", "", "value = os.sep", ""]
+    for i in range(max(options.lines - len(lines), 0)):
+        if rng.random() < options.string_density:
+            line = f"var_{i} = {make_string(rng, options)}"
+        else:
+            line = f"var_{i} = len(value) + {i}"
+        if rng.random() < options.noqa:
+            line += "  # noqa"
+        lines.append(line)
+    if rng.random() < options.errors:
+        lines.append(rng.choice(error_lines))
+    return "\n".join(lines) + "\n"
+
+
+def get_tree_path(index: int, files_per_dir: int = 500) -> str:
+    """Relative path of file with index: directories have at most files_per_dir files"""
+    d = index // files_per_dir
+    return os.path.join(f"pkg_{d // 100}", f"module_{d}", f"file_{index}.py")
+
+
+def iter_tree(seed: int, options: SimpleNamespace) -> Iterator[Tuple[str, str]]:
+    """Relative paths and sources of files, they are generated one by one"""
+    for index in range(options.files):
+        yield get_tree_path(index), generate_source(seed, index, options)
+
+
+def write_tree(root: str, seed: int, options: SimpleNamespace) -> int:
+    """Write files into root, return count of written bytes"""
+    size = 0
+    dirs = set()
+    for path, source in iter_tree(seed, options):
+        dirname = os.path.join(root, os.path.dirname(path))
+        if dirname not in dirs:
+            os.makedirs(dirname, exist_ok=True)
+            dirs.add(dirname)
+        data = source.encode("utf-8")
+        with open(os.path.join(root, path), "wb") as f:
+            f.write(data)
+        size += len(data)
+    return size
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = get_options()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Directory of generated tree")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--lines", type=int, default=defaults.lines, help="Lines in each file")
+    parser.add_argument("--string-density", type=float, default=defaults.string_density, help="Part of lines with strings")
+    parser.add_argument("--prefixes", default=",".join(defaults.prefixes), help="Comma separated prefixes, empty item is no prefix")
+    parser.add_argument("--quotes", default=",".join(defaults.quotes), help="Comma separated quotes")
+    parser.add_argument("--escape-density", type=float, default=defaults.escape_density, help="Part of strings with escapes")
+    parser.add_argument("--noqa", type=float, default=defaults.noqa, help="Part of lines with noqa comment")
+    parser.add_argument("--errors", type=float, default=defaults.errors, help="Part of files which can't be tokenized")
+    args = parser.parse_args(argv)
+
+    options = get_options(
+        files=args.files,
+        lines=args.lines,
+        string_density=args.string_density,
+        prefixes=args.prefixes.split(","),
+        quotes=[x for x in args.quotes.split(",") if x],
+        escape_density=args.escape_density,
+        noqa=args.noqa,
+        errors=args.errors,
+    )
+    size = write_tree(args.out, args.seed, options)
+    print(f"Files: {options.files}, size: {size / 1024 / 1024:.1f} MB, directory: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
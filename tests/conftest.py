@@ -23,6 +23,12 @@ def collect_types_fixture() -> Any:
     collect_types.stop()
 
 
+@pytest.fixture(autouse=True)  # type: ignore
+def cache_home_fixture(tmp_path: Any, monkeypatch: Any) -> None:
+    """Cache of formatted files is written into temporary directory, not into cache of user"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache_home"))
+
+
 def pytest_sessionfinish(session: Any, exitstatus: Any) -> None:
     os.makedirs("build/", exist_ok=True)
     collect_types.dump_stats("build/type_info.json")
@@ -0,0 +1,110 @@
+import os
+import random
+from typing import Any
+
+import pytest  # type: ignore
+
+from autopep8_quotes._util._format import isevaluatable
+from autopep8_quotes.modules.formater.normalize_string_quotes import formatter
+from autopep8_quotes.modules.formater.normalize_string_quotes import get_quote_regex
+from autopep8_quotes.modules.formater.normalize_string_quotes import memo
+from autopep8_quotes.modules.formater.normalize_string_quotes import memo_cache
+
+testdata_escape_body = []
+testdata_escape_body.append(("abc", "", '"', '"abc"'))
+testdata_escape_body.append(('a"b', "", '"', '"a\\"b"'))
+testdata_escape_body.append(('a\\"b', "", '"', '"a\\"b"'))
+testdata_escape_body.append(('a"', "", '"""', '"""a\\""""'))
+testdata_escape_body.append(('a"""b', "b", '"""', 'b"""a""\\"b"""'))
+testdata_escape_body.append(("a'b", "r", "'''", "r'''a'b'''"))
+testdata_escape_body.append(('a"b', "f", '"', 'f""'))
+
+
+@pytest.mark.basic  # type: ignore
+@pytest.mark.parametrize("body,prefix,quote,expect", testdata_escape_body)  # type: ignore
+def test_escape_body(body: str, prefix: str, quote: str, expect: str) -> None:
+    assert formatter().escape_body(body, prefix, quote) == expect
+
+
+@pytest.mark.basic  # type: ignore
+def test_escape_body__same_as_bruteforce() -> None:
+    # When bruteforce_body() gives right string, escape_body() gives same string
+    random.seed(0)
+    fmt = formatter()
+    checked = 0
+    for _ in range(3000):
+        orig_quote = random.choice(['"', "'", '"""', "'''"])
+        new_quote = random.choice(['"', "'", '"""', "'''"])
+        prefix = random.choice(["", "b", "r", "f"])
+        body = "".join(random.choice(["a", "'", '"', "\\\\", " ", "\\n", "\\'", '\\"', "{x}"]) for _ in range(random.randint(0, 10)))
+        original = f"{prefix}{orig_quote}{body}{orig_quote}"
+        v0_res = isevaluatable(original, prefix)
+        if not v0_res[0]:
+            continue
+
+        v3 = fmt.bruteforce_body(body, prefix, new_quote)
+        v3_res = isevaluatable(v3, prefix)
+        if v3_res[0] and (v3_res[1] == v0_res[1]) and (v0_res[1] != "" or prefix != "f"):
+            assert fmt.escape_body(body, prefix, new_quote) == v3
+            checked += 1
+    assert checked > 1000
+
+
+@pytest.mark.basic  # type: ignore
+def test_escape_body__long_literal() -> None:
+    # Such literal could be changed only by escaping quotes symbol by symbol
+    body = "ab\\'\\'\\'c" * 2000
+    source = f"a = '''{body}\"'''\r\n"
+
+    from autopep8_quotes._util._main import format_code
+    from autopep8_quotes.args import agrs_parse
+    args = agrs_parse(["--print-disable"])
+    args._read_filename = "long_literal.py"
+    result = format_code(source, args=args, filename="long_literal.py")
+    assert result == 'a = """' + "ab'''c" * 2000 + '\\""""\r\n'
+
+
+@pytest.mark.basic  # type: ignore
+def test_get_quote_regex() -> None:
+    assert get_quote_regex("'", '"') is get_quote_regex("'", '"')
+    assert get_quote_regex("'", '"') is not get_quote_regex('"', "'")
+
+
+@pytest.mark.basic  # type: ignore
+def test_memo_cache() -> None:
+    cache = memo_cache(2)
+    cache.set(("a", '"', '"""'), "A")
+    cache.set(("b", '"', '"""'), "B")
+    assert cache.get(("a", '"', '"""')) == "A"
+    cache.set(("c", '"', '"""'), "C")
+    # "b" is least recently used
+    assert cache.get(("b", '"', '"""')) is None
+    assert cache.get(("a", '"', '"""')) == "A"
+    assert cache.get(("c", '"', '"""')) == "C"
+
+
+@pytest.mark.basic  # type: ignore
+def test_memo__same_result(tmp_path: Any, monkeypatch: Any) -> None:
+    from autopep8_quotes._util._log_sink import close_logs
+    from autopep8_quotes._util._main import format_code
+    from autopep8_quotes.args import agrs_parse
+
+    # --nsq-log-transform writes log/ into current directory
+    monkeypatch.chdir(tmp_path)
+
+    source = "a = 'a'\r\nb = 'a'\r\nc = \"b'\"\r\nd = \"b'\"\r\n"
+    for inline_quotes in ['"', "'"]:
+        memo.clear()
+        args = agrs_parse(["--print-disable", f"--inline-quotes={inline_quotes}"])
+        args._read_filename = "memo.py"
+        result = format_code(source, args=args, filename="memo.py")
+        assert args._stats["nsq.memo.hit"] == 2
+        assert args._stats["nsq.memo.miss"] == 2
+
+        args = agrs_parse(["--print-disable", "--nsq-log-transform", f"--inline-quotes={inline_quotes}"])
+        assert result == format_code(source, args=args, filename="memo.py")
+        assert args._stats["nsq.memo.hit"] == 0
+
+    # Logs are written by background thread: close them while tmp_path is current directory
+    close_logs()
+    assert os.listdir(tmp_path / "log")